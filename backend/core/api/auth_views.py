@@ -5,16 +5,19 @@ from rest_framework import status
 
 from django.contrib.auth import authenticate, get_user_model
 
-from django.utils.crypto import get_random_string
-from backend.core.emails import send_email_verification
+from backend.core.auth_backends import login_throttled
+from backend.core.emails import send_email_verification, send_sms_verification
+from backend.core.token_denylist import deny
+from backend.core.unread import unread_counts
+from backend.core.verification import issue_code, redeem_code
 
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from backend.core.models import User, YouthProfile
 from backend.core.serializers import YouthProfileSerializer
 
-from django.db import IntegrityError
-from django.db.models import Q
+from django.db import IntegrityError, transaction
 from datetime import date
 
 User = get_user_model()
@@ -31,9 +34,14 @@ def login_view(request):
     username = request.data.get("username")
     password = request.data.get("password")
 
-    user = authenticate(username=username, password=password)
+    user = authenticate(request, username=username, password=password)
 
     if user is None:
+        if username and login_throttled(request, username):
+            return Response(
+                {"detail": "Too many failed attempts. Try again later."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
         return Response(
             {"detail": "Invalid credentials"},
             status=status.HTTP_401_UNAUTHORIZED
@@ -61,6 +69,24 @@ def login_view(request):
     })
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def logout_view(request):
+    token = request.data.get("refresh")
+
+    if not token:
+        return Response({"detail": "Refresh token is required"}, status=400)
+
+    try:
+        refresh = RefreshToken(token)
+    except TokenError:
+        return Response({"detail": "Invalid or expired token"}, status=400)
+
+    deny(refresh["jti"], refresh["exp"])
+
+    return Response({"message": "Logged out"})
+
+
 # Admin-only: Register officers/admins
 
 @api_view(["POST"])
@@ -101,16 +127,11 @@ def login_user(request):
     identifier = request.data.get("identifier")  # username OR email
     password = request.data.get("password")
 
-    try:
-        user = User.objects.get(
-            Q(username=identifier) | Q(email=identifier)
-        )
-    except User.DoesNotExist:
-        return Response({"detail": "Invalid credentials"}, status=401)
-
-    user = authenticate(username=user.username, password=password)
+    user = authenticate(request, username=identifier, password=password)
 
     if not user:
+        if identifier and login_throttled(request, identifier):
+            return Response({"detail": "Too many failed attempts. Try again later."}, status=429)
         return Response({"detail": "Invalid credentials"}, status=401)
 
     return Response({
@@ -176,29 +197,24 @@ def onboard_youth(request):
             return Response({"detail": "Email already registered"}, status=400)
 
     # -------- CREATE USER --------
-    verification_code = get_random_string(6, allowed_chars="0123456789")
-
-    user = User.objects.create_user(
-        username=email,
-        email=email,
-        password=password,
-        role="youth",
-        is_active=True,
-        is_verified=False,
-        profile_complete=False,
-        lga=lga,
-        date_of_birth=dob_value
+    with transaction.atomic():
+        user = User.objects.create_user(
+            username=email,
+            email=email,
+            password=password,
+            role="youth",
+            is_active=True,
+            is_verified=False,
+            profile_complete=False,
+            lga=lga,
+            date_of_birth=dob_value
 
-    )
+        )
 
-    user.verification_code = verification_code
-    user.save()
+        verification_code = issue_code(user)
 
-    # -------- SEND EMAIL (SAFE) --------
-    try:
+        # -------- QUEUE EMAIL (sent by the outbox worker) --------
         send_email_verification(user.email, verification_code)
-    except Exception as e:
-        print("Email sending failed:", e)
 
     return Response(
         {"message": "Verification code sent to email"},
@@ -208,20 +224,16 @@ def onboard_youth(request):
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def verify_account(request):
+    email = request.data.get("email")
+    phone = request.data.get("phone")
     code = request.data.get("code")
 
-    if not code:
-        return Response({"detail": "Verification code required"}, status=400)
+    if not (email or phone) or not code:
+        return Response({"detail": "Email or phone and verification code required"}, status=400)
 
-    try:
-        user = User.objects.get(verification_code=code)
-    except User.DoesNotExist:
+    if redeem_code(code, email=email, phone=phone) is None:
         return Response({"detail": "Invalid or expired code"}, status=400)
 
-    user.is_verified = True
-    user.verification_code = None
-    user.save()
-
     return Response({"message": "Account verified"})
 
 
@@ -237,18 +249,20 @@ def resend_verification(request):
         elif phone:
             user = User.objects.get(phone=phone)
         else:
-            return Response({"detail": "Provide email"}, status=400)
+            return Response({"detail": "Provide email or phone"}, status=400)
     except User.DoesNotExist:
         return Response({"detail": "User not found"}, status=404)
 
     if user.is_verified:
         return Response({"detail": "Account already verified"}, status=400)
 
-    code = get_random_string(6, allowed_chars="0123456789")
-    user.verification_code = code
-    user.save()
+    with transaction.atomic():
+        code = issue_code(user)
 
-    # TODO: resend email or SMS
+        if user.email:
+            send_email_verification(user.email, code)
+        else:
+            send_sms_verification(user.phone, code)
 
     return Response({"message": "Verification resent"})
 
@@ -297,6 +311,7 @@ def complete_profile(request):
 @permission_classes([IsAuthenticated])
 def current_user(request):
     user = request.user
+    unread = unread_counts(user)
 
     return Response({
         "username": user.username,
@@ -304,7 +319,8 @@ def current_user(request):
         "role": user.role,
         "is_verified": user.is_verified,
         "profile_complete": user.profile_complete,
-        "unread_tickets": 0,
+        "unread_tickets": unread["ticket_messages"],
+        "unread_notifications": unread["notifications"],
         "first_name": user.first_name,
         "middle_name": user.middle_name,
         "surname": user.surname,
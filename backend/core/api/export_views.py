@@ -1,96 +1,116 @@
-from django.http import HttpResponse
-from datetime import datetime
+from collections.abc import Mapping
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 import csv
 
-from reportlab.pdfgen import canvas
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from backend.core.models import ReportJob
+from backend.core.permissions import IsAdmin
+from backend.core.reports import (
+    clean_filters,
+    fail_stale_jobs,
+    filter_tickets,
+    render_tickets_pdf,
+    submit_report,
+)
+from backend.core.serializers import ReportJobSerializer
+
+CSV_HEADER = ["ID", "Title", "Category", "Status", "Youth", "Officer", "Escalation", "Deadline"]
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "category",
+    "status",
+    "youth__username",
+    "officer__username",
+    "escalation_level",
+    "sla_deadline",
+)
+# Rows fetched per round trip from the server-side cursor
+CSV_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv_rows(tickets):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+
+    rows = tickets.order_by("id").values_list(*CSV_COLUMNS)
+    for row in rows.iterator(chunk_size=CSV_CHUNK_SIZE):
+        yield writer.writerow(["" if value is None else value for value in row])
 
-from backend.core.models import Ticket
 
 # CSV Export with filters
 def export_tickets_csv(request):
     tickets = get_filtered_tickets(request)
 
-    response = HttpResponse(content_type="text/csv")
+    response = StreamingHttpResponse(stream_csv_rows(tickets), content_type="text/csv")
     response["Content-Disposition"] = 'attachment; filename="tickets_report.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(["ID", "Title", "Category", "Status", "Youth", "Officer", "Escalation", "Deadline"])
-
-    for t in tickets:
-        writer.writerow([
-            t.id,
-            t.title,
-            t.category,
-            t.status,
-            t.youth.username if t.youth else "",
-            t.officer.username if t.officer else "",
-            t.escalation_level,
-            t.deadline,
-        ])
-
     return response
 
-# PDF Export with filters
+# PDF Export with filters (small reports; large ones should use the job API)
 def export_tickets_pdf(request):
     tickets = get_filtered_tickets(request)
 
     response = HttpResponse(content_type="application/pdf")
     response["Content-Disposition"] = 'attachment; filename="tickets_report.pdf"'
 
-    p = canvas.Canvas(response)
-    p.setFont("Helvetica", 12)
-    p.drawString(100, 800, "Tickets Report")
+    render_tickets_pdf(tickets, response)
+    return response
 
-    y = 780
-    for t in tickets:
-        line = f"{t.id} | {t.title} | {t.category} | {t.status} | {t.deadline}"
-        p.drawString(100, y, line)
-        y -= 20
 
-        # Prevent writing off the page
-        if y < 50:
-            p.showPage()
-            p.setFont("Helvetica", 12)
-            y = 800
+# Background PDF reports: submit, poll, download
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def submit_pdf_report(request):
+    if not isinstance(request.data, Mapping):
+        return Response(
+            {"detail": "Request body must be an object of report filters"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    p.showPage()
-    p.save()
-    return response
+    filters = clean_filters({**request.query_params.dict(), **request.data})
+    job = submit_report(filters, request.user)
+
+    return Response(ReportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def pdf_report_status(request, job_id):
+    fail_stale_jobs(ReportJob.objects.filter(id=job_id))
+    job = get_object_or_404(ReportJob, id=job_id)
+    return Response(ReportJobSerializer(job).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def download_pdf_report(request, job_id):
+    job = get_object_or_404(ReportJob, id=job_id)
+    if job.status != "done" or not job.file:
+        return Response(
+            {"detail": "Report is not ready"},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename="tickets_report.pdf",
+        content_type="application/pdf",
+    )
 
 
 # Helper to filter tickets based on query parameters
 def get_filtered_tickets(request):
-    qs = Ticket.objects.all()
-
-    # Query params
-    start_date = request.GET.get("start_date")
-    end_date = request.GET.get("end_date")
-    status = request.GET.get("status")
-    category = request.GET.get("category")
-
-    # Date validation
-    def parse_date(date_str):
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%d").date()
-        except (ValueError, TypeError):
-            return None
-
-    start_date_obj = parse_date(start_date)
-    end_date_obj = parse_date(end_date)
-
-    if start_date_obj:
-        qs = qs.filter(created_at__date__gte=start_date_obj)
-    if end_date_obj:
-        qs = qs.filter(created_at__date__lte=end_date_obj)
-
-    # Status validation
-    valid_statuses = ["open", "in_progress", "resolved"]
-    if status in valid_statuses:
-        qs = qs.filter(status=status)
-
-    # Category validation
-    valid_categories = ["grants", "training", "startup", "incident"]
-    if category in valid_categories:
-        qs = qs.filter(category=category)
-
-    return qs
\ No newline at end of file
+    return filter_tickets(clean_filters(request.GET))
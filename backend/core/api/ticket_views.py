@@ -1,15 +1,22 @@
+import hashlib
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery, prefetch_related_objects
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from django.db.models.functions import Coalesce
+
+from backend.core.authentication import CachedJWTAuthentication
+from backend.core.duplicates import find_duplicate, index_ticket, signature_buckets
 from backend.core.models import (
     Ticket,
     TicketMessage,
+    TicketNote,
     Notification,
     User,
 
@@ -17,49 +24,119 @@ from backend.core.models import (
 
 from backend.core.serializers import (
     TicketSerializer,
+    TicketListSerializer,
     TicketMessageSerializer,
     TicketNoteSerializer,
 )
 from backend.core.permissions import IsAdmin, IsOfficer 
-from backend.core.notifications.utils import send_whatsapp_doubletick
+from backend.core.pagination import (
+    FeedPagination,
+    OldestFirstCursorPagination,
+    wants_cursor,
+)
+from backend.core.notifications.outbox import enqueue
 from backend.core.permissions import IsYouth
+from backend.core.realtime import broadcast
+from backend.core.unread import mark_ticket_read
+from backend.core.utils import log_action
+from backend.core.workload import claim_least_loaded_officer
 
 def auto_assign_officer():
         """
-        Assign officer with the least active workload.
-        Active = open or in_progress tickets.
+        Claim the officer with the least active workload.
+        Active = open or in_progress tickets, read from the maintained
+        OfficerWorkload counters. Call inside the ticket's transaction.
         """
 
-        officers = (
-            User.objects
-            .filter(role="officer", is_active=True)
-            .annotate(
-                active_tickets=Count(
-                    "assigned_tickets",
-                    filter=Q(
-                        assigned_tickets__status__in=["open", "in_progress"]
-                    )
-                )
-            )
-            .order_by("active_tickets", "date_joined")
+        return claim_least_loaded_officer()
+
+
+def with_list_stats(queryset):
+    """
+    Annotate a ticket queryset for TicketListSerializer.
+    One grouped query per page instead of loading every conversation.
+    """
+    return queryset.select_related("youth", "officer").annotate(
+        message_count=Count("messages"),
+        last_activity=Coalesce(Max("messages__created_at"), "updated_at"),
+    )
+
+
+def with_detail_stamp(queryset):
+    """
+    Annotate what the detail ETag is built from. Subqueries rather than
+    joins, so long conversations don't multiply rows.
+    """
+    def child(model, aggregate):
+        rows = model.objects.filter(ticket=OuterRef("pk")).order_by().values("ticket")
+        return Subquery(rows.annotate(value=aggregate).values("value"))
+
+    return queryset.annotate(
+        stamp_messages=child(TicketMessage, Count("id")),
+        stamp_last_message=child(TicketMessage, Max("created_at")),
+        stamp_notes=child(TicketNote, Count("id")),
+        stamp_last_note=child(TicketNote, Max("created_at")),
+    )
+
+
+class ConditionalRetrieveMixin:
+    """
+    Ticket detail with ETag / Last-Modified. The stamp is annotated onto
+    the ticket row, so a 304 costs that one query: no prefetch and no
+    serialization. Note edits touch Ticket.updated_at (signals.py).
+    """
+    detail_prefetch = ("messages__sender", "internal_notes__author")
+
+    def retrieve(self, request, *args, **kwargs):
+        ticket = self.get_object()
+
+        stamp = (
+            ticket.pk, ticket.updated_at,
+            ticket.stamp_messages, ticket.stamp_last_message,
+            ticket.stamp_notes, ticket.stamp_last_note,
         )
+        etag = '"%s"' % hashlib.sha1(repr(stamp).encode()).hexdigest()
+        last_modified = int(max(
+            moment for moment in (
+                ticket.updated_at, ticket.stamp_last_message, ticket.stamp_last_note
+            ) if moment
+        ).timestamp())
+
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+
+        prefetch_related_objects([ticket], *self.detail_prefetch)
+        response = Response(self.get_serializer(ticket).data)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
 
-        return officers.first()  
+# Page sizes for incremental message sync
+MESSAGE_SYNC_LIMIT = 100
+MESSAGE_SYNC_MAX_LIMIT = 500
 
+# Actions that return collections use the slim list representation
+LIST_ACTIONS = {"list", "unassigned_tickets", "my_tickets"}
 
-class TicketViewSet(viewsets.ModelViewSet):
+
+class TicketViewSet(ConditionalRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = TicketSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
+    pagination_class = FeedPagination
 
     queryset = Ticket.objects.select_related(
         "youth", "officer"
-    ).order_by("-created_at")
+    ).order_by("-created_at", "-id")
 
     # =========================
     # ROLE-BASED VISIBILITY
     # =========================
-    def get_queryset(self):
+    def _visible_tickets(self):
         user = self.request.user
 
         if user.role == "admin":
@@ -72,24 +149,67 @@ class TicketViewSet(viewsets.ModelViewSet):
         # Youth sees own tickets
         return self.queryset.filter(youth=user)
 
+    def get_queryset(self):
+        queryset = self._visible_tickets()
+
+        if self.action in LIST_ACTIONS:
+            return with_list_stats(queryset)
+
+        if self.action == "retrieve":
+            return with_detail_stamp(queryset)
+
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in LIST_ACTIONS:
+            return TicketListSerializer
+        return TicketSerializer
+
     # =========================
     # CREATE TICKET (YOUTH)
     # =========================
     def perform_create(self, serializer):
-        officer = auto_assign_officer()
-
-        ticket = serializer.save(
-            youth=self.request.user,
-            status="open",
-            escalation_level=1,
-            officer=officer,  
+        youth = self.request.user
+        buckets = signature_buckets(
+            serializer.validated_data["title"],
+            serializer.validated_data["description"],
         )
 
-        if officer:
-            Notification.objects.create(
-                user=officer,
-                message=f"New ticket assigned: {ticket.title}"
+        with transaction.atomic():
+            original = find_duplicate(youth, buckets)
+            if original is not None:
+                # A resubmission: link it to the first copy and give it to
+                # the same officer, without a second assignment notice
+                ticket = serializer.save(
+                    youth=youth,
+                    status="open",
+                    escalation_level=1,
+                    officer=original.officer,
+                    duplicate_of_id=original.duplicate_of_id or original.id,
+                )
+                index_ticket(ticket, buckets)
+                log_action(
+                    youth,
+                    f"Ticket flagged as duplicate of #{ticket.duplicate_of_id}",
+                    ticket=ticket,
+                )
+                return
+
+            officer = auto_assign_officer()
+
+            ticket = serializer.save(
+                youth=youth,
+                status="open",
+                escalation_level=1,
+                officer=officer,  
             )
+            index_ticket(ticket, buckets)
+
+            if officer:
+                Notification.objects.create(
+                    user=officer,
+                    message=f"New ticket assigned: {ticket.title}"
+                )
 
     
 
@@ -105,7 +225,7 @@ class TicketViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        tickets = self.queryset.filter(officer__isnull=True)
+        tickets = with_list_stats(self.queryset.filter(officer__isnull=True))
         serializer = self.get_serializer(tickets, many=True)
         return Response(serializer.data)
 
@@ -124,35 +244,96 @@ class TicketViewSet(viewsets.ModelViewSet):
             serializer = TicketMessageSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
 
-            message = TicketMessage.objects.create(
-                ticket=ticket,
-                sender=request.user,
-                message=serializer.validated_data["message"],
-            )
-            # SEND MESSAGE VIA WEBSOCKET
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                f"ticket_{ticket.id}",
-                {
-                    "type": "chat_message",
-                    "data": {
-                        "id": message.id,
-                        "sender_name": message.sender.username,
-                        "message": message.message,
-                        "created_at": message.created_at.isoformat(),
-                    },
-                }
-            )
+            with transaction.atomic():
+                message = TicketMessage.objects.create(
+                    ticket=ticket,
+                    sender=request.user,
+                    message=serializer.validated_data["message"],
+                )
+                # SEND MESSAGE VIA WEBSOCKET (after commit, off the request path)
+                broadcast(
+                    f"ticket_{ticket.id}",
+                    {
+                        "type": "chat_message",
+                        "data": {
+                            "id": message.id,
+                            "sender_name": message.sender.username,
+                            "message": message.message,
+                            "created_at": message.created_at.isoformat(),
+                        },
+                    }
+                )
             return Response(
                 TicketMessageSerializer(message).data,
                 status=status.HTTP_201_CREATED
             )
 
         # GET messages
-        messages = ticket.messages.select_related("sender").order_by("created_at")
-        serializer = TicketMessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        messages = ticket.messages.select_related("sender").order_by("created_at", "id")
+
+        if wants_cursor(request):
+            paginator = OldestFirstCursorPagination()
+            page = paginator.paginate_queryset(messages, request, view=self)
+            serializer = TicketMessageSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        # Delta sync: ?after_id=<last seen id> or ?since=<ISO timestamp>.
+        # Without either, the oldest MESSAGE_SYNC_LIMIT messages are returned.
+        return self._message_delta(ticket, messages, request.query_params)
+
+    def _message_delta(self, ticket, messages, params):
+        after_id = params.get("after_id")
+        since = params.get("since")
+
+        if after_id:
+            if not after_id.isdigit():
+                return Response(
+                    {"detail": "after_id must be a message id"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            anchor = ticket.messages.filter(id=after_id).values_list("created_at", flat=True).first()
+            if anchor is None:
+                return Response(
+                    {"detail": "Unknown after_id for this ticket"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Keyset on (created_at, id), served by the (ticket, created_at, id) index
+            messages = messages.filter(
+                Q(created_at__gt=anchor) | Q(created_at=anchor, id__gt=after_id)
+            )
+        elif since:
+            try:
+                since_value = parse_datetime(since)
+            except ValueError:
+                # Well-formed but impossible, e.g. 2024-02-30T00:00:00
+                since_value = None
+            if since_value is None:
+                return Response(
+                    {"detail": "since must be an ISO 8601 timestamp"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            messages = messages.filter(created_at__gt=since_value)
 
+        try:
+            limit = min(int(params.get("limit", MESSAGE_SYNC_LIMIT)), MESSAGE_SYNC_MAX_LIMIT)
+        except ValueError:
+            limit = MESSAGE_SYNC_LIMIT
+        limit = max(limit, 1)
+
+        # One extra row tells the client whether to fetch again right away
+        page = list(messages[:limit + 1])
+        serializer = TicketMessageSerializer(page[:limit], many=True)
+        return Response(
+            serializer.data,
+            headers={"X-Has-More": "true" if len(page) > limit else "false"},
+        )
+
+
+    @action(detail=True, methods=["post"], url_path="mark-read", permission_classes=[IsAuthenticated])
+    def mark_read(self, request, pk=None):
+        ticket = self.get_object()
+        marked = mark_ticket_read(ticket, request.user)
+        return Response({"marked_read": marked})
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def add_note(self, request, pk=None):
@@ -181,7 +362,7 @@ class TicketViewSet(viewsets.ModelViewSet):
         url_path="my-tickets",
     )
     def my_tickets(self, request):
-        tickets = Ticket.objects.filter(youth=request.user)
+        tickets = with_list_stats(self.queryset.filter(youth=request.user))
         serializer = self.get_serializer(tickets, many=True)
         return Response(serializer.data)
 
@@ -202,35 +383,39 @@ class TicketViewSet(viewsets.ModelViewSet):
                 {"detail": "You cannot escalate this ticket"},
                 status=403,
             )
-        ticket.escalation_level += 1
-        ticket.status = "in_progress"
-        ticket.save()
-
-        # 🔑 LOG ESCALATION INTO THE SAME CONVERSATION
-        TicketMessage.objects.create(
-            ticket=ticket,
-            sender=user,
-            message=f"⚠️ Ticket escalated to Level {ticket.escalation_level}"
-        )
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"ticket_{ticket.id}",
-            {
-                "type": "chat_message",
-                "data": {
-                    "sender_name": user.username,
-                    "message": f"⚠️ Ticket escalated to Level {ticket.escalation_level}",
-                    "created_at": ticket.updated_at.isoformat(),
-                },
-            }
-        )
+        with transaction.atomic():
+            ticket.escalation_level += 1
+            ticket.status = "in_progress"
+            ticket.save()
 
-        # Optional notifications (fine where they are)
-        if ticket.youth.phone:
-            send_whatsapp_doubletick(
-                ticket.youth.phone,
-                f"Your ticket '{ticket.title}' has been escalated."
+            # 🔑 LOG ESCALATION INTO THE SAME CONVERSATION
+            message = TicketMessage.objects.create(
+                ticket=ticket,
+                sender=user,
+                message=f"⚠️ Ticket escalated to Level {ticket.escalation_level}"
+            )
+            broadcast(
+                f"ticket_{ticket.id}",
+                {
+                    "type": "chat_message",
+                    "data": {
+                        "id": message.id,
+                        "sender_name": user.username,
+                        "message": message.message,
+                        "created_at": message.created_at.isoformat(),
+                    },
+                }
             )
+
+            # Delivered by the outbox worker, not in this request
+            if ticket.youth.phone:
+                enqueue(
+                    "whatsapp",
+                    ticket.youth.phone,
+                    f"Your ticket '{ticket.title}' has been escalated.",
+                    key=f"ticket-{ticket.id}-escalated-L{ticket.escalation_level}-whatsapp",
+                )
+
         return Response({
             "message": "Ticket escalated",
             "escalation_level": ticket.escalation_level
@@ -281,10 +466,11 @@ class TicketViewSet(viewsets.ModelViewSet):
         #     f"Your ticket '{ticket.title}' has been reassigned."
         # )
 
-        # log_audit.delay(
-        #     request.user.id,
-        #     f"Reassigned ticket {ticket.id} to {officer.username}"
-        # )
+        log_action(
+            request.user,
+            f"Reassigned ticket {ticket.id} to {officer.username}",
+            ticket=ticket,
+        )
 
         return Response(
             TicketSerializer(ticket).data,
@@ -328,10 +514,11 @@ class TicketViewSet(viewsets.ModelViewSet):
         #     f"Your ticket '{ticket.title}' status changed to {new_status}"
         # )
 
-        # log_audit.delay(
-        #     request.user.id,
-        #     f"Updated ticket {ticket.id} status to {new_status}"
-        # )
+        log_action(
+            request.user,
+            f"Updated ticket {ticket.id} status to {new_status}",
+            ticket=ticket,
+        )
 
         return Response(
             {"message": f"Ticket status updated to {new_status}"},
@@ -355,27 +542,35 @@ class TicketViewSet(viewsets.ModelViewSet):
         })
 
 
-class OfficerTicketViewSet(viewsets.ReadOnlyModelViewSet):
-    serializer_class = TicketSerializer
+class OfficerTicketViewSet(ConditionalRetrieveMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        return Ticket.objects.filter(officer=user).order_by("-created_at")
+        queryset = Ticket.objects.filter(officer=user).order_by("-created_at")
+
+        if self.action == "list":
+            return with_list_stats(queryset)
+        return with_detail_stamp(queryset.select_related("youth", "officer"))
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TicketListSerializer
+        return TicketSerializer
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsOfficer])
 def officer_tickets(request):
-    tickets = Ticket.objects.filter(officer=request.user)
-    serializer = TicketSerializer(tickets, many=True)
+    tickets = with_list_stats(Ticket.objects.filter(officer=request.user))
+    serializer = TicketListSerializer(tickets, many=True)
     return Response(serializer.data)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated, IsAdmin])
 def admin_tickets(request):
-    tickets = Ticket.objects.all()
-    serializer = TicketSerializer(tickets, many=True)
+    tickets = with_list_stats(Ticket.objects.all())
+    serializer = TicketListSerializer(tickets, many=True)
     return Response(serializer.data)
 
@@ -0,0 +1,81 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db.models import Q
+
+# Failed logins allowed per identifier / per client IP within the window
+LOGIN_FAILURE_LIMIT = getattr(settings, "LOGIN_FAILURE_LIMIT", 5)
+LOGIN_IP_FAILURE_LIMIT = getattr(settings, "LOGIN_IP_FAILURE_LIMIT", 50)
+LOGIN_FAILURE_WINDOW = getattr(settings, "LOGIN_FAILURE_WINDOW", 300)  # seconds
+
+
+def _throttle_keys(request, identifier):
+    digest = hashlib.sha256(str(identifier).strip().lower().encode()).hexdigest()
+    keys = {f"login-fail:id:{digest}": LOGIN_FAILURE_LIMIT}
+
+    ip = request.META.get("REMOTE_ADDR") if request is not None else None
+    if ip:
+        keys[f"login-fail:ip:{ip}"] = LOGIN_IP_FAILURE_LIMIT
+    return keys
+
+
+def login_throttled(request, identifier):
+    keys = _throttle_keys(request, identifier)
+    counts = cache.get_many(list(keys))
+    return any(counts.get(key, 0) >= limit for key, limit in keys.items())
+
+
+def record_login_failure(request, identifier):
+    for key in _throttle_keys(request, identifier):
+        cache.add(key, 0, LOGIN_FAILURE_WINDOW)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, LOGIN_FAILURE_WINDOW)
+
+
+def clear_login_failures(request, identifier):
+    # Only the identifier: one good login shouldn't unblock a noisy IP
+    key = next(iter(_throttle_keys(request, identifier)))
+    cache.delete(key)
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """
+    Authenticate with a username or an email address in one indexed
+    query. Callers over the failure limit are rejected before the
+    password hash is checked.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if not username or password is None:
+            return None
+
+        if login_throttled(request, username):
+            return None
+
+        candidates = list(
+            UserModel._default_manager
+            .filter(Q(username=username) | Q(email=username))[:2]
+        )
+        # A username match wins; an email shared by two accounts matches neither
+        user = next((u for u in candidates if u.username == username), None)
+        if user is None and len(candidates) == 1:
+            user = candidates[0]
+
+        if user is None:
+            # Run the hasher anyway so unknown accounts take as long as real ones
+            UserModel().set_password(password)
+        elif user.check_password(password) and self.user_can_authenticate(user):
+            clear_login_failures(request, username)
+            return user
+
+        record_login_failure(request, username)
+        return None
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# Columns kept in the cache entry: what request handlers read off the
+# user. The rest are loaded together on first access (User.refresh_from_db).
+CACHED_USER_FIELDS = (
+    "id", "username", "email", "role", "lga", "phone",
+    "first_name", "middle_name", "surname",
+    "is_active", "is_staff", "is_superuser", "is_verified", "profile_complete",
+)
+USER_CACHE_SECONDS = getattr(settings, "JWT_USER_CACHE_SECONDS", 60)
+
+
+def user_cache_key(user_id):
+    # Versioned: entries are positional rows of CACHED_USER_FIELDS
+    return f"jwt-user:v2:{user_id}"
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def get_cached_user(user_id):
+    """
+    Return the user with CACHED_USER_FIELDS loaded (the rest deferred),
+    or None. Hits the database only on a cache miss.
+    """
+    user_model = get_user_model()
+    # from_db expects a partial row in model field order
+    field_names = [
+        field.attname for field in user_model._meta.concrete_fields
+        if field.attname in CACHED_USER_FIELDS
+    ]
+
+    key = user_cache_key(user_id)
+    values = cache.get(key)
+    if values is None:
+        values = (
+            user_model.objects
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list(*field_names)
+            .first()
+        )
+        if values is None:
+            return None
+        cache.set(key, values, USER_CACHE_SECONDS)
+
+    return user_model.from_db(router.db_for_read(user_model), field_names, values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from a short-lived cache
+    entry instead of a query per request.
+
+    The user is rebuilt with `from_db`, so columns outside
+    CACHED_USER_FIELDS are deferred and `save()` only writes loaded or
+    assigned fields. Entries are dropped on User save / delete; changes
+    made with queryset.update() show up once the TTL expires.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares the password hash, which is not cached
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -1,4 +1,80 @@
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.db import transaction
+
+from backend.core import unread
+from backend.core.models import Ticket, TicketMessage
+from backend.core.realtime import dispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBatcher:
+    """
+    Collects chat messages posted within `window` seconds (or up to
+    `max_batch` of them) and persists them with a single bulk_create.
+    Each caller gets back its own saved message.
+    """
+
+    def __init__(self, window=0.05, max_batch=200):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+
+    async def add(self, ticket_id, sender_id, text):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(
+            (TicketMessage(ticket_id=ticket_id, sender_id=sender_id, message=text), future)
+        )
+
+        if len(self._pending) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(
+                self.window, lambda: asyncio.ensure_future(self.flush())
+            )
+
+        return await future
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        try:
+            saved = await database_sync_to_async(self.save_batch)(
+                [message for message, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for message, (_, future) in zip(saved, batch):
+            if not future.done():
+                future.set_result(message)
+
+    @staticmethod
+    def save_batch(messages):
+        # bulk_create skips signals, so count unread messages here
+        with transaction.atomic():
+            saved = TicketMessage.objects.bulk_create(messages)
+            unread.messages_created(saved)
+        return saved
+
+
+message_batcher = MessageBatcher()
+
 
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
@@ -9,6 +85,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             return
 
         self.group_name = f"notifications_{user.id}"
+        dispatcher.attach(asyncio.get_running_loop())
 
         await self.channel_layer.group_add(
             self.group_name,
@@ -27,15 +104,26 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         await self.send_json(event["data"])
 
 class TicketChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Ticket conversation socket.
+
+    Relays `chat_message` events to the client, and accepts
+    {"type": "message", "message": "...", "client_id": "..."} from it.
+    Inbound messages are persisted in batches and acknowledged with
+    {"type": "ack", "client_id": ..., "id": ..., "created_at": ...}.
+    """
+
     async def connect(self):
         user = self.scope["user"]
         self.ticket_id = self.scope["url_route"]["kwargs"]["ticket_id"]
 
-        if not user.is_authenticated:
+        if not user.is_authenticated or not await self.can_access_ticket(user):
             await self.close()
             return
 
         self.group_name = f"ticket_{self.ticket_id}"
+        self.saving = set()
+        dispatcher.attach(asyncio.get_running_loop())
 
         await self.channel_layer.group_add(
             self.group_name,
@@ -44,10 +132,76 @@ class TicketChatConsumer(AsyncJsonWebsocketConsumer):
         await self.accept()
 
     async def disconnect(self, close_code):
+        if not hasattr(self, "group_name"):
+            return
+        # Let messages already received finish saving
+        await asyncio.gather(*self.saving, return_exceptions=True)
         await self.channel_layer.group_discard(
             self.group_name,
             self.channel_name
         )
 
+    async def can_access_ticket(self, user):
+        # Same visibility rules as TicketViewSet
+        tickets = Ticket.objects.filter(id=self.ticket_id)
+        if user.role == "officer":
+            tickets = tickets.filter(officer=user)
+        elif user.role != "admin":
+            tickets = tickets.filter(youth=user)
+        return await tickets.aexists()
+
+    async def receive_json(self, content, **kwargs):
+        if content.get("type") != "message":
+            return
+
+        text = str(content.get("message") or "").strip()
+        client_id = content.get("client_id")
+        if not text:
+            await self.send_json({
+                "type": "error",
+                "client_id": client_id,
+                "detail": "Message cannot be empty",
+            })
+            return
+
+        # Save in a task: Channels handles one event at a time per socket,
+        # so awaiting the batch window here would stall this socket's reads
+        task = asyncio.ensure_future(self.save_message(text, client_id))
+        self.saving.add(task)
+        task.add_done_callback(self.saving.discard)
+
+    async def save_message(self, text, client_id):
+        user = self.scope["user"]
+        try:
+            message = await message_batcher.add(int(self.ticket_id), user.id, text)
+        except Exception:
+            logger.exception("Saving chat message for ticket %s failed", self.ticket_id)
+            await self.send_json({
+                "type": "error",
+                "client_id": client_id,
+                "detail": "Message could not be saved",
+            })
+            return
+        created_at = message.created_at.isoformat()
+
+        await self.send_json({
+            "type": "ack",
+            "client_id": client_id,
+            "id": message.id,
+            "created_at": created_at,
+        })
+        await self.channel_layer.group_send(
+            self.group_name,
+            {
+                "type": "chat_message",
+                "data": {
+                    "id": message.id,
+                    "sender_name": user.username,
+                    "message": message.message,
+                    "created_at": created_at,
+                },
+            }
+        )
+
     async def chat_message(self, event):
         await self.send_json(event["data"])
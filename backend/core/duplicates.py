@@ -0,0 +1,107 @@
+import hashlib
+import random
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from backend.core.models import Ticket, TicketSignatureBand
+
+NUM_BANDS = 16
+ROWS_PER_BAND = 2
+SHINGLE_SIZE = 3  # words
+# Only a youth's recent open tickets are compared
+DUPLICATE_WINDOW = timedelta(days=getattr(settings, "DUPLICATE_TICKET_DAYS", 14))
+# Matching bands needed to flag a duplicate: 8 of 16 two-row bands is
+# roughly a shingle Jaccard similarity of 0.7
+DUPLICATE_MIN_BANDS = getattr(settings, "DUPLICATE_TICKET_MIN_BANDS", 8)
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: stored buckets are only comparable under the same permutations
+_rng = random.Random(8151)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(_PRIME))
+    for _ in range(NUM_BANDS * ROWS_PER_BAND)
+]
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def shingles(title, description):
+    words = re.findall(r"\w+", f"{title} {description}".lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature_buckets(title, description):
+    """
+    MinHash the ticket's word shingles and return one bucket per band.
+    The band number is part of each bucket hash, so buckets from
+    different bands never collide.
+    """
+    hashes = [_hash64(shingle) for shingle in shingles(title, description)]
+    if not hashes:
+        return []
+
+    signature = [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(repr((band, rows)).encode(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def find_duplicate(youth, buckets):
+    """
+    Return the youth's recent open ticket sharing the most bands with
+    `buckets` (at least DUPLICATE_MIN_BANDS), or None. Reads only the
+    matching band rows, never the youth's ticket history.
+    """
+    if not buckets:
+        return None
+
+    match = (
+        TicketSignatureBand.objects
+        .filter(
+            youth=youth,
+            bucket__in=buckets,
+            created_at__gte=timezone.now() - DUPLICATE_WINDOW,
+            ticket__status__in=Ticket.ACTIVE_STATUSES,
+        )
+        .values("ticket_id")
+        .annotate(hits=Count("id"))
+        .filter(hits__gte=DUPLICATE_MIN_BANDS)
+        .order_by("-hits", "ticket_id")
+        .first()
+    )
+    if match is None:
+        return None
+    return Ticket.objects.select_related("officer").get(pk=match["ticket_id"])
+
+
+def index_ticket(ticket, buckets):
+    TicketSignatureBand.objects.bulk_create(
+        TicketSignatureBand(ticket=ticket, youth_id=ticket.youth_id, bucket=bucket)
+        for bucket in buckets
+    )
+
+
+def purge_old_signatures(chunk_size=5000):
+    """Delete band rows older than the lookup window; returns the number removed."""
+    removed = 0
+    while True:
+        ids = list(
+            TicketSignatureBand.objects
+            .filter(created_at__lt=timezone.now() - DUPLICATE_WINDOW)
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return removed
+        removed += TicketSignatureBand.objects.filter(id__in=ids).delete()[0]
@@ -1,8 +1,11 @@
-from django.core.mail import send_mail
-from django.conf import settings
+from backend.core.notifications.outbox import enqueue
 
 
 def send_email_verification(email, code):
+    """
+    Queue the verification code on the notification outbox. Call inside
+    the signup transaction; the outbox worker sends it after commit.
+    """
     subject = "Verify your Benue Youth HelpDesk account"
     message = (
         "Welcome to Benue Youth HelpDesk.\n\n"
@@ -10,10 +13,14 @@ def send_email_verification(email, code):
         "If you did not create this account, please ignore this email."
     )
 
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[email],
-        fail_silently=False,
-    )
\ No newline at end of file
+    enqueue("email", email, message, subject=subject, key=f"verify-{email}-{code}")
+
+
+def send_sms_verification(phone, code):
+    """Queue the verification code as an SMS, for accounts without an email."""
+    message = (
+        f"Your Benue Youth HelpDesk verification code is {code}. "
+        "If you did not create this account, ignore this message."
+    )
+
+    enqueue("sms", phone, message, key=f"verify-{phone}-{code}")
@@ -0,0 +1,47 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.core.notifications.utils import build_email, send_bulk_email
+
+BACKENDS = {
+    "console": "django.core.mail.backends.console.EmailBackend",
+    "locmem": "django.core.mail.backends.locmem.EmailBackend",
+    # Uses the EMAIL_HOST settings and really sends; point it at a test server
+    "smtp": "django.core.mail.backends.smtp.EmailBackend",
+}
+
+
+class Command(BaseCommand):
+    help = "Measure email throughput for different connection batch sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", choices=sorted(BACKENDS), default="locmem")
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000])
+
+    def handle(self, *args, **options):
+        backend = BACKENDS[options["backend"]]
+        # Write console output to memory so terminal speed doesn't skew timings
+        connection_kwargs = {"stream": io.StringIO()} if options["backend"] == "console" else {}
+
+        for batch_size in options["batch_sizes"]:
+            messages = [
+                build_email(f"user{i}@example.com", "Benchmark", "Benchmark message body.")
+                for i in range(options["messages"])
+            ]
+
+            start = time.perf_counter()
+            errors = send_bulk_email(
+                messages, batch_size=batch_size, backend=backend, **connection_kwargs
+            )
+            elapsed = time.perf_counter() - start
+
+            failed = sum(1 for error in errors if error)
+            self.stdout.write(
+                f"batch={batch_size:>5}  {len(messages) / elapsed:>10.0f} msg/s  "
+                f"({elapsed:.3f}s, {failed} failed)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("✅ Email benchmark complete"))
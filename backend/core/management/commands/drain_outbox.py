@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.core.task import process_notification_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver pending WhatsApp, SMS and email messages from the notification outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="Keep draining until interrupted")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between drains with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            sent = process_notification_outbox(batch_size=options["batch_size"])
+            self.stdout.write(f"Sent {sent} messages")
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
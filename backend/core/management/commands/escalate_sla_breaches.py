@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.task import escalate_sla_breaches
+
+
+class Command(BaseCommand):
+    help = "Escalate open and in-progress tickets that are past their SLA deadline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        escalated = escalate_sla_breaches(chunk_size=options["chunk_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Escalated {escalated} tickets"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.task import purge_denied_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete denylisted refresh tokens that have expired"
+
+    def handle(self, *args, **options):
+        removed = purge_denied_tokens()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {removed} expired denylist entries"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.task import purge_ticket_signatures
+
+
+class Command(BaseCommand):
+    help = "Delete duplicate-detection signatures older than the lookup window"
+
+    def handle(self, *args, **options):
+        removed = purge_ticket_signatures()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {removed} ticket signature rows"))
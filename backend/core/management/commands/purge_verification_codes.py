@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.task import purge_verification_codes
+
+
+class Command(BaseCommand):
+    help = "Delete expired account verification codes"
+
+    def handle(self, *args, **options):
+        removed = purge_verification_codes()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {removed} expired verification codes"))
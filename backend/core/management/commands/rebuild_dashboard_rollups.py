@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.core.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard ticket and feedback rollups"
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            rebuild_rollups()
+
+        self.stdout.write(self.style.SUCCESS("✅ Dashboard rollups rebuilt"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.core.workload import rebuild_workloads
+
+
+class Command(BaseCommand):
+    help = "Recount open and in-progress tickets per officer"
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            rebuild_workloads()
+
+        self.stdout.write(self.style.SUCCESS("✅ Officer workloads rebuilt"))
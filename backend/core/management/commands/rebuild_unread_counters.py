@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.core.unread import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recount unread ticket messages and notifications per user"
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            rebuild_counters()
+
+        self.stdout.write(self.style.SUCCESS("✅ Unread counters rebuilt"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.task import send_deadline_reminders
+
+
+class Command(BaseCommand):
+    help = "Queue reminders for open and in-progress tickets due within 24 hours"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        reminded = send_deadline_reminders(chunk_size=options["chunk_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Queued reminders for {reminded} tickets"))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_user_date_of_birth'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YouthHubCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('details', models.TextField()),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['-created_at', '-id'], name='ticket_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['officer', '-created_at', '-id'], name='ticket_officer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['youth', '-created_at', '-id'], name='ticket_youth_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketmessage',
+            index=models.Index(fields=['ticket', 'created_at', 'id'], name='ticketmsg_ticket_created_idx'),
+        ),
+    ]
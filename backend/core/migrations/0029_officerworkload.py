@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_workloads(apps, schema_editor):
+    User = apps.get_model("core", "User")
+    OfficerWorkload = apps.get_model("core", "OfficerWorkload")
+
+    officers = User.objects.filter(role="officer").annotate(
+        active=Count(
+            "assigned_tickets",
+            filter=Q(assigned_tickets__status__in=["open", "in_progress"]),
+        )
+    )
+    OfficerWorkload.objects.bulk_create(
+        OfficerWorkload(officer_id=officer.id, active_tickets=officer.active)
+        for officer in officers
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfficerWorkload',
+            fields=[
+                ('officer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('active_tickets', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['active_tickets', 'officer'], name='workload_least_loaded_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_workloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Ticket = apps.get_model("core", "Ticket")
+    Feedback = apps.get_model("core", "Feedback")
+    TicketRollup = apps.get_model("core", "TicketRollup")
+    FeedbackRollup = apps.get_model("core", "FeedbackRollup")
+
+    ticket_rows = (
+        Ticket.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "status", "escalation_level", "youth__lga", "officer")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    TicketRollup.objects.bulk_create(
+        (
+            TicketRollup(
+                day=row["day"],
+                status=row["status"],
+                escalation_level=row["escalation_level"],
+                lga=row["youth__lga"],
+                officer_id=row["officer"],
+                count=row["count"],
+            )
+            for row in ticket_rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+    feedback_rows = (
+        Feedback.objects.annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(count=Count("id"), rating_sum=Sum("rating"))
+        .order_by()
+    )
+    FeedbackRollup.objects.bulk_create(
+        FeedbackRollup(**row) for row in feedback_rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_officerworkload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TicketRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=30)),
+                ('escalation_level', models.PositiveSmallIntegerField()),
+                ('lga', models.CharField(blank=True, max_length=80, null=True)),
+                ('count', models.IntegerField(default=0)),
+                ('officer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'status', 'escalation_level', 'lga', 'officer'], name='ticket_rollup_bucket_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
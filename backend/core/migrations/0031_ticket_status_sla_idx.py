@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_dashboard_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', 'sla_deadline'], name='ticket_status_sla_idx'),
+        ),
+    ]
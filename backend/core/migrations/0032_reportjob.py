@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_ticket_status_sla_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('filters_hash', models.CharField(db_index=True, max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('file', models.FileField(blank=True, null=True, upload_to='reports/')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:30
+
+import django.db.models.deletion
+from django.conf import settings
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_counters(apps, schema_editor):
+    TicketMessage = apps.get_model("core", "TicketMessage")
+    Notification = apps.get_model("core", "Notification")
+    UnreadCounter = apps.get_model("core", "UnreadCounter")
+
+    totals = {}
+
+    def add(rows, key, field):
+        for row in rows:
+            if row[key] is not None:
+                totals.setdefault(row[key], Counter())[field] += row["count"]
+
+    unread = TicketMessage.objects.filter(is_read=False)
+    add(
+        unread.exclude(sender=F("ticket__youth"))
+        .values("ticket__youth").annotate(count=Count("id")).order_by(),
+        "ticket__youth", "ticket_messages",
+    )
+    add(
+        unread.filter(sender=F("ticket__youth"))
+        .values("ticket__officer").annotate(count=Count("id")).order_by(),
+        "ticket__officer", "ticket_messages",
+    )
+    add(
+        Notification.objects.filter(is_read=False)
+        .values("user").annotate(count=Count("id")).order_by(),
+        "user", "notifications",
+    )
+
+    UnreadCounter.objects.bulk_create(
+        UnreadCounter(user_id=user_id, **counts) for user_id, counts in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('ticket_messages', models.PositiveIntegerField(default=0)),
+                ('notifications', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:35
+
+import django.db.models.deletion
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_pending_codes(apps, schema_editor):
+    # Old codes had no expiry; give them one fresh validity window
+    User = apps.get_model("core", "User")
+    VerificationCode = apps.get_model("core", "VerificationCode")
+    expires_at = timezone.now() + timedelta(minutes=getattr(settings, "VERIFICATION_CODE_MINUTES", 30))
+
+    pending = (
+        User.objects.filter(is_verified=False, verification_code__isnull=False)
+        .exclude(verification_code="")
+        .values_list("id", "verification_code")
+    )
+    VerificationCode.objects.bulk_create(
+        (
+            VerificationCode(user_id=user_id, code=code, expires_at=expires_at)
+            for user_id, code in pending.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_ticket_reminder_sent_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(blank=True, db_index=True, max_length=254, verbose_name='email address'),
+        ),
+        migrations.CreateModel(
+            name='VerificationCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=6)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='verification_codes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'code'], name='verifycode_user_code_idx')],
+            },
+        ),
+        migrations.RunPython(copy_pending_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='verification_code',
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_verificationcode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeniedToken',
+            fields=[
+                ('jti', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
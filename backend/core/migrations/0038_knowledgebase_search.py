@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:46
+
+from django.db import migrations, models
+
+
+# Postgres: a stored generated tsvector (title weighted above content)
+# with a GIN index, so matching never re-parses documents.
+PG_FORWARD = [
+    """
+    ALTER TABLE core_knowledgebase ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX kb_search_vector_idx ON core_knowledgebase USING GIN (search_vector)",
+]
+PG_BACKWARD = [
+    "DROP INDEX IF EXISTS kb_search_vector_idx",
+    "ALTER TABLE core_knowledgebase DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# Note: SQLite table rebuilds (some later AlterField migrations) drop
+# these triggers; recreate them if core_knowledgebase is rebuilt.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_knowledgebase_fts USING fts5(
+        title, content,
+        content='core_knowledgebase', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_knowledgebase_fts_ai AFTER INSERT ON core_knowledgebase BEGIN
+        INSERT INTO core_knowledgebase_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER core_knowledgebase_fts_ad AFTER DELETE ON core_knowledgebase BEGIN
+        INSERT INTO core_knowledgebase_fts(core_knowledgebase_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER core_knowledgebase_fts_au AFTER UPDATE ON core_knowledgebase BEGIN
+        INSERT INTO core_knowledgebase_fts(core_knowledgebase_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO core_knowledgebase_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO core_knowledgebase_fts(core_knowledgebase_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_knowledgebase_fts_ai",
+    "DROP TRIGGER IF EXISTS core_knowledgebase_fts_ad",
+    "DROP TRIGGER IF EXISTS core_knowledgebase_fts_au",
+    "DROP TABLE IF EXISTS core_knowledgebase_fts",
+]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_deniedtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='knowledgebase',
+            index=models.Index(fields=['category', '-created_at'], name='kb_category_created_idx'),
+        ),
+        migrations.RunPython(
+            run({"postgresql": PG_FORWARD, "sqlite": SQLITE_FORWARD}),
+            run({"postgresql": PG_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
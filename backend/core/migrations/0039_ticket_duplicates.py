@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_knowledgebase_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='core.ticket'),
+        ),
+        migrations.CreateModel(
+            name='TicketSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='core.ticket')),
+                ('youth', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['youth', 'bucket', 'created_at'], name='ticketband_youth_bucket_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_ticketrollup_unique_bucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:06
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_split_buckets(apps, schema_editor):
+    # Fold rows left by racing first writes into one row per bucket
+    TicketRollup = apps.get_model("core", "TicketRollup")
+    key = ("day", "status", "escalation_level", "lga", "officer")
+
+    split = (
+        TicketRollup.objects.values(*key)
+        .annotate(rows=Count("id"), keep=Min("id"), total=Sum("count"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for bucket in split.iterator():
+        rows = TicketRollup.objects.filter(**{field: bucket[field] for field in key})
+        rows.exclude(id=bucket["keep"]).delete()
+        rows.filter(id=bucket["keep"]).update(count=bucket["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_reportjob_heartbeat_at'),
+    ]
+
+    operations = [
+        # The previous constraint was skipped where NULLs are distinct
+        migrations.RunPython(merge_split_buckets, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='ticketrollup',
+            name='ticket_rollup_bucket_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='ticketrollup',
+            constraint=models.UniqueConstraint(models.F('day'), models.F('status'), models.F('escalation_level'), django.db.models.functions.comparison.Coalesce('lga', models.Value('')), django.db.models.functions.comparison.Coalesce('officer', models.Value(0)), name='ticket_rollup_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:08
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+
+
+def copy_youth_lga(apps, schema_editor):
+    # Tickets take their youth's current LGA, so the rollups are recounted
+    Ticket = apps.get_model("core", "Ticket")
+    User = apps.get_model("core", "User")
+    TicketRollup = apps.get_model("core", "TicketRollup")
+
+    Ticket.objects.update(
+        lga=Subquery(User.objects.filter(pk=OuterRef("youth_id")).values("lga")[:1])
+    )
+
+    TicketRollup.objects.all().delete()
+    rows = (
+        Ticket.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "status", "escalation_level", "sla_breached", "lga", "officer")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    TicketRollup.objects.bulk_create(
+        (
+            TicketRollup(
+                day=row["day"],
+                status=row["status"],
+                escalation_level=row["escalation_level"],
+                sla_breached=row["sla_breached"],
+                lga=row["lga"],
+                officer_id=row["officer"],
+                count=row["count"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_ticketrollup_coalesced_bucket'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='ticketrollup',
+            name='ticket_rollup_bucket_uniq',
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='lga',
+            field=models.CharField(blank=True, max_length=80, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='sla_breached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='ticketrollup',
+            name='sla_breached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(copy_youth_lga, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ticketrollup',
+            constraint=models.UniqueConstraint(models.F('day'), models.F('status'), models.F('escalation_level'), models.F('sla_breached'), django.db.models.functions.comparison.Coalesce('lga', models.Value('')), django.db.models.functions.comparison.Coalesce('officer', models.Value(0)), name='ticket_rollup_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_ticket_lga_sla_breached'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceVersion',
+            fields=[
+                ('namespace', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+            ],
+        ),
+    ]
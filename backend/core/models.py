@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser 
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta, date
@@ -8,6 +9,41 @@ from django.contrib.auth import get_user_model
 User = settings.AUTH_USER_MODEL
 
 
+class TrackedFieldsMixin:
+    """
+    Remember the values of `tracked_fields` as last read from / written to
+    the database, so signal handlers can apply deltas without re-reading
+    the row.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def snapshot_tracked_fields(self):
+        self._loaded_values = {
+            name: self.__dict__.get(name) for name in self.tracked_fields
+        }
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        if fields is None:
+            self.snapshot_tracked_fields()
+        elif self.loaded_values() is not None:
+            self._loaded_values.update(
+                (name, self.__dict__.get(name)) for name in self.tracked_fields if name in fields
+            )
+
+    def loaded_values(self):
+        return getattr(self, "_loaded_values", None)
+
+    def tracked_values(self):
+        return {name: getattr(self, name) for name in self.tracked_fields}
+
+
 class MinistryInfo(models.Model):
     name = models.CharField(max_length=255)
     department_unit = models.CharField(max_length=255, blank=True)
@@ -79,7 +115,7 @@ class EscalationMatrix(models.Model):
         return f"{self.workflow} - L{self.level} -> {self.target_role}"
     
 
-class User(AbstractUser):
+class User(TrackedFieldsMixin, AbstractUser):
     ROLE_CHOICES = [
         ('youth', 'Youth'),
         ('officer', 'Officer'),
@@ -87,6 +123,8 @@ class User(AbstractUser):
         ('superadmin', 'Super Admin'),
     ]
     first_name = models.CharField(max_length=100, blank=True, null=True)
+    # Indexed: signup, resend and verification all look users up by email
+    email = models.EmailField("email address", blank=True, db_index=True)
     
     middle_name = models.CharField(max_length=100, blank=True, null=True)
     surname = models.CharField(max_length=100, blank=True, null=True)
@@ -98,11 +136,57 @@ class User(AbstractUser):
     is_verified = models.BooleanField(default=False)
     profile_complete = models.BooleanField(default=False)
 
-    verification_code = models.CharField(max_length=6, blank=True, null=True)
+    # Tickets carry a copy of the youth's LGA for the dashboard rollups
+    tracked_fields = ("lga",)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        # Reading one deferred column (e.g. on the cached JWT user) loads
+        # all of them in one query instead of one query per column
+        if fields is not None:
+            fields = set(fields)
+            deferred_fields = self.get_deferred_fields()
+            if fields.intersection(deferred_fields):
+                fields = fields.union(deferred_fields)
+        super().refresh_from_db(using, fields, **kwargs)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
 
+
+class VerificationCode(models.Model):
+    """
+    Pending account verification code. Looked up by (user, code), with
+    the user found by email; expired rows are purged in the background.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="verification_codes"
+    )
+    code = models.CharField(max_length=6)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "code"], name="verifycode_user_code_idx"),
+        ]
+
+    def __str__(self):
+        return f"Code for {self.user_id} (expires {self.expires_at})"
+
+class DeniedToken(models.Model):
+    """
+    Refresh-token jti that may no longer be used. Rows are purged once
+    the token would have expired anyway, so the table stays bounded.
+    """
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
 class YouthHubCategory(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -126,6 +210,14 @@ class KnowledgeBase(models.Model):
     attachment = models.FileField(upload_to='knowledgebase/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Full-text search lives outside the model: a generated tsvector
+    # column on Postgres, an FTS5 table on SQLite (migration 0038, search.py)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "-created_at"], name="kb_category_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.category})"
 
@@ -133,7 +225,7 @@ def default_deadline():
     """Return SLA deadline 24 hours from now."""
     return timezone.now() + timedelta(hours=24)
 
-class Ticket(models.Model):
+class Ticket(TrackedFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('open', 'Open'),
         ('in_progress', 'In Progress'),
@@ -146,6 +238,11 @@ class Ticket(models.Model):
         (3, "L3"),
     ]
 
+    # Statuses that count towards an officer's workload
+    ACTIVE_STATUSES = ("open", "in_progress")
+
+    tracked_fields = ("status", "officer_id", "escalation_level", "lga", "sla_breached")
+
     youth = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -178,14 +275,42 @@ class Ticket(models.Model):
         default=1
     )
 
+    # Earlier open ticket from the same youth that this one repeats
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates"
+    )
+
     sla_deadline = models.DateTimeField(null=True, blank=True)
+    # Set by task.escalate_sla_breaches once the deadline has passed
+    sla_breached = models.BooleanField(default=False)
+    # The youth's LGA, copied so rollups never load the youth; kept in step
+    # by rollups.youth_lga_changed
+    lga = models.CharField(max_length=80, blank=True, null=True)
+    # Set by task.send_deadline_reminders so reruns skip reminded tickets
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination on (created_at, id), per visibility scope
+            models.Index(fields=["-created_at", "-id"], name="ticket_created_id_idx"),
+            models.Index(fields=["officer", "-created_at", "-id"], name="ticket_officer_created_idx"),
+            models.Index(fields=["youth", "-created_at", "-id"], name="ticket_youth_created_idx"),
+            # SLA sweeps walk breached active tickets in deadline order
+            models.Index(fields=["status", "sla_deadline"], name="ticket_status_sla_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.sla_deadline:
             self.sla_deadline = timezone.now() + timedelta(hours=72)
+        if self._state.adding and self.lga is None:
+            self.lga = self.youth.lga
         super().save(*args, **kwargs)
 
     def escalate(self):
@@ -197,6 +322,133 @@ class Ticket(models.Model):
         return f"{self.title} ({self.status})"  
 
 
+class TicketSignatureBand(models.Model):
+    """
+    One LSH band of a ticket's MinHash signature (see duplicates.py).
+    Youth and created_at are copied from the ticket so duplicate lookups
+    stay on one index; rows past the lookup window are purged.
+    """
+    ticket = models.ForeignKey(
+        Ticket,
+        on_delete=models.CASCADE,
+        related_name="signature_bands"
+    )
+    youth = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    bucket = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["youth", "bucket", "created_at"], name="ticketband_youth_bucket_idx"),
+        ]
+
+    def __str__(self):
+        return f"Band {self.bucket} of ticket {self.ticket_id}"
+
+
+class OfficerWorkload(models.Model):
+    """
+    Active (open + in progress) ticket count per officer.
+    Maintained by signals on ticket changes, so assignment never has to
+    aggregate the ticket table.
+    """
+    officer = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="workload"
+    )
+    active_tickets = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["active_tickets", "officer"], name="workload_least_loaded_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.officer_id}: {self.active_tickets} active"
+
+
+class TicketRollup(models.Model):
+    """
+    Ticket counts per day x status x escalation level x SLA breached x
+    LGA x officer.
+    Maintained by signals as tickets change; rebuild with
+    `manage.py rebuild_dashboard_rollups`.
+    """
+    day = models.DateField()
+    status = models.CharField(max_length=30)
+    escalation_level = models.PositiveSmallIntegerField()
+    sla_breached = models.BooleanField(default=False)
+    lga = models.CharField(max_length=80, blank=True, null=True)
+    officer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # One row per bucket, so concurrent first writes can't split a
+            # bucket. NULL LGA / officer are coalesced so they compare equal
+            # on every backend.
+            models.UniqueConstraint(
+                "day",
+                "status",
+                "escalation_level",
+                "sla_breached",
+                Coalesce("lga", models.Value("")),
+                Coalesce("officer", models.Value(0)),
+                name="ticket_rollup_bucket_uniq",
+            ),
+        ]
+
+
+class FeedbackRollup(models.Model):
+    """Feedback count and rating sum per day."""
+    day = models.DateField(unique=True)
+    count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+
+
+class ReportJob(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    filters = models.JSONField(default=dict, blank=True)
+    # Identical filter sets share a finished report
+    filters_hash = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    file = models.FileField(upload_to="reports/", blank=True, null=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Touched by the worker as pages render; a stale one means the worker died
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Report #{self.id} ({self.status})"
+
+
 class AuditLog(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -213,7 +465,7 @@ class AuditLog(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
 
 
-class TicketMessage(models.Model):
+class TicketMessage(TrackedFieldsMixin, models.Model):
     ticket = models.ForeignKey(
         "Ticket",
         on_delete=models.CASCADE,
@@ -227,11 +479,25 @@ class TicketMessage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    tracked_fields = ("is_read",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["ticket", "created_at", "id"], name="ticketmsg_ticket_created_idx"),
+        ]
+
+    def recipient_id(self, ticket=None):
+        """The other party: youth messages go to the officer, the rest to the youth."""
+        ticket = ticket or self.ticket
+        if self.sender_id == ticket.youth_id:
+            return ticket.officer_id
+        return ticket.youth_id
+
     def __str__(self):
         return f"Message on Ticket #{self.ticket.id}"
 
     
-class Feedback(models.Model):
+class Feedback(TrackedFieldsMixin, models.Model):
     RATING_CHOICES = [
         (1, 'Very Poor'),
         (2, 'Poor'),
@@ -246,6 +512,8 @@ class Feedback(models.Model):
     comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    tracked_fields = ("rating",)
+
     def __str__(self):
         return f"Feedback by {self.youth.username} on Ticket {self.ticket.id}"
 
@@ -266,15 +534,92 @@ class TicketNote(models.Model):
         return f"Note on Ticket #{self.ticket.id}"
 
 
-class Notification(models.Model):
+class Notification(TrackedFieldsMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     message = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    tracked_fields = ("is_read",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="notif_user_created_idx"),
+        ]
+
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message}" 
 
+class OutboxMessage(models.Model):
+    """
+    Outgoing WhatsApp / SMS / email, written in the request's transaction
+    and delivered by the outbox worker with retries.
+    """
+    CHANNEL_CHOICES = [
+        ("whatsapp", "WhatsApp"),
+        ("sms", "SMS"),
+        ("email", "Email"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES)
+    recipient = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255, blank=True)
+    body = models.TextField()
+    # Enqueueing the same key twice sends once
+    idempotency_key = models.CharField(max_length=255, unique=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {self.recipient} ({self.status})"
+
+
+class UnreadCounter(models.Model):
+    """
+    Unread ticket messages and notifications per user.
+    Maintained on insert and on read so page loads never count rows.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="unread"
+    )
+    ticket_messages = models.PositiveIntegerField(default=0)
+    notifications = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.ticket_messages} messages, {self.notifications} notifications"
+
+
+class ReferenceVersion(models.Model):
+    """
+    Version stamp per reference-data namespace (see reference_cache.py).
+    Kept in the database so every worker agrees on it, whatever cache
+    backend is configured.
+    """
+    namespace = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.namespace}: {self.version}"
+
+
 class Poll(models.Model):
     question = models.CharField(max_length=255)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -0,0 +1,244 @@
+# notifications/outbox.py
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.core.models import OutboxMessage
+from backend.core.notifications.utils import (
+    EMAIL_BATCH_SIZE,
+    build_email,
+    send_bulk_email,
+    send_bulk_sms,
+    send_email,
+    send_sms_africastalking,
+    send_whatsapp_doubletick,
+)
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = timedelta(seconds=30)
+# Gateway calls in flight at once per drain
+OUTBOX_CONCURRENCY = getattr(settings, "OUTBOX_CONCURRENCY", 8)
+# Claimed rows stay hidden from other workers this long. If a worker dies
+# mid-send, its rows come due again once the lease runs out.
+CLAIM_LEASE = timedelta(seconds=getattr(settings, "OUTBOX_CLAIM_SECONDS", 300))
+
+
+class DeliveryError(Exception):
+    pass
+
+
+def enqueue(channel, recipient, body, subject="", key=None):
+    """
+    Queue a message for delivery. Call inside the request's transaction:
+    the row commits (or rolls back) with the change that triggered it.
+    A repeated `key` is ignored.
+    """
+    enqueue_many([
+        OutboxMessage(
+            channel=channel,
+            recipient=recipient,
+            subject=subject,
+            body=body,
+            idempotency_key=key or uuid.uuid4().hex,
+        )
+    ])
+
+
+def enqueue_many(messages):
+    OutboxMessage.objects.bulk_create(messages, ignore_conflicts=True, batch_size=1000)
+
+
+def _send_whatsapp(message):
+    return send_whatsapp_doubletick(message.recipient, message.body)
+
+
+def _send_sms(message):
+    return send_sms_africastalking(message.recipient, message.body)
+
+
+def _send_email(message):
+    return send_email(message.recipient, message.subject, message.body)
+
+
+SENDERS = {
+    "whatsapp": _send_whatsapp,
+    "sms": _send_sms,
+    "email": _send_email,
+}
+
+
+def deliver(message):
+    # The gateway helpers report failures as {"error": ...} instead of raising
+    result = SENDERS[message.channel](message)
+    if isinstance(result, dict) and "error" in result:
+        raise DeliveryError(result["error"])
+
+
+def _attempt(message):
+    """Deliver one message; returns None or the error."""
+    try:
+        deliver(message)
+    except Exception as e:
+        return e
+    return None
+
+
+def backoff(attempts):
+    return BACKOFF_BASE * (2 ** (attempts - 1))
+
+
+def _record_failure(message, error, now):
+    message.last_error = str(error)[:2000]
+    if message.attempts >= MAX_ATTEMPTS:
+        message.status = "failed"
+    else:
+        message.next_attempt_at = now + backoff(message.attempts)
+
+
+def _record_success(message, now):
+    message.status = "sent"
+    message.sent_at = now
+    message.last_error = ""
+
+
+def _send_sms_group(group):
+    """
+    Send SMS rows sharing a body as multi-recipient calls.
+    Returns {message id: None or error}.
+    """
+    body = group[0].body
+    try:
+        errors = send_bulk_sms(body, [message.recipient for message in group])
+    except Exception as e:
+        errors = {message.recipient: str(e) for message in group}
+
+    return {
+        message.id: errors.get(message.recipient, "No delivery status returned")
+        for message in group
+    }
+
+
+def _send_email_group(group):
+    """Send email rows over one SMTP connection. Returns {message id: None or error}."""
+    try:
+        errors = send_bulk_email([
+            build_email(message.recipient, message.subject, message.body)
+            for message in group
+        ])
+    except Exception as e:
+        errors = [str(e)] * len(group)
+
+    return {message.id: error for message, error in zip(group, errors)}
+
+
+def deliver_batch(batch):
+    """
+    Deliver a batch concurrently: one task per SMS body group, one per
+    EMAIL_BATCH_SIZE emails and one per other message.
+    Returns {message id: None or error}.
+    """
+    sms_groups = defaultdict(list)
+    emails, singles = [], []
+    for message in batch:
+        if message.channel == "sms":
+            sms_groups[message.body].append(message)
+        elif message.channel == "email":
+            emails.append(message)
+        else:
+            singles.append(message)
+
+    groups = [(_send_sms_group, group) for group in sms_groups.values()]
+    groups += [
+        (_send_email_group, emails[start:start + EMAIL_BATCH_SIZE])
+        for start in range(0, len(emails), EMAIL_BATCH_SIZE)
+    ]
+
+    outcome = {}
+    with ThreadPoolExecutor(max_workers=OUTBOX_CONCURRENCY) as pool:
+        group_results = [pool.submit(send, group) for send, group in groups]
+        single_results = pool.map(_attempt, singles)
+
+        for result in group_results:
+            outcome.update(result.result())
+        for message, error in zip(singles, single_results):
+            outcome[message.id] = error
+
+    return outcome
+
+
+def claim_batch(batch_size):
+    """
+    Claim due rows in a short transaction: count the attempt and push
+    next_attempt_at past CLAIM_LEASE so other workers skip them. No lock
+    is held while the gateways are called.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        for message in batch:
+            message.attempts += 1
+            message.next_attempt_at = now + CLAIM_LEASE
+        OutboxMessage.objects.bulk_update(batch, ["attempts", "next_attempt_at"])
+
+    return batch
+
+
+def record_outcome(batch, outcome):
+    """
+    Store delivery results for a claimed batch. A row whose lease ran out
+    and was claimed again (its attempts moved on) is left to the newer
+    claim. Returns (sent, retried_or_failed).
+    """
+    now = timezone.now()
+    sent = errors = 0
+
+    with transaction.atomic():
+        current = set(
+            OutboxMessage.objects
+            .select_for_update()
+            .filter(id__in=[message.id for message in batch], status="pending")
+            .values_list("id", "attempts")
+        )
+        claimed = [message for message in batch if (message.id, message.attempts) in current]
+
+        for message in claimed:
+            error = outcome[message.id]
+            if error:
+                _record_failure(message, error, now)
+                errors += 1
+            else:
+                _record_success(message, now)
+                sent += 1
+
+        OutboxMessage.objects.bulk_update(
+            claimed,
+            ["status", "next_attempt_at", "last_error", "sent_at"],
+        )
+
+    return sent, errors
+
+
+def drain_outbox(batch_size=500):
+    """
+    Deliver one batch of due messages. Rows are claimed with
+    SKIP LOCKED and a lease, so several workers can drain in parallel.
+    Gateway calls run concurrently outside any transaction, SMS rows with
+    the same body go out as one multi-recipient call and emails share
+    SMTP connections.
+    Returns (sent, retried_or_failed).
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    return record_outcome(batch, deliver_batch(batch))
@@ -1,9 +1,10 @@
 # notifications/utils.py
 import os
+import threading
 import requests
 import africastalking
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 
 
 # WhatsApp via DoubleTick
@@ -19,34 +20,136 @@ def send_whatsapp_doubletick(phone_number, message):
             "from": settings.DOUBLETICK_SENDER_ID,
             "text": message,
         }
-        response = requests.post(url, json=payload, headers=headers)
+        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response.raise_for_status()
         return response.json()
     except Exception as e:
         return {"error": str(e)}
 
 
 # SMS via Africa’s Talking
+# Recipients per API call for bulk sends
+SMS_BATCH_SIZE = getattr(settings, "AFRICASTALKING_BATCH_SIZE", 500)
+
+_sms_service = None
+_sms_lock = threading.Lock()
+
+
+def get_sms_service():
+    """Initialise the Africa's Talking SDK once per process."""
+    global _sms_service
+    if _sms_service is None:
+        with _sms_lock:
+            if _sms_service is None:
+                africastalking.initialize(
+                    settings.AFRICASTALKING_USERNAME,
+                    settings.AFRICASTALKING_API_KEY
+                )
+                _sms_service = africastalking.SMS
+    return _sms_service
+
+
+def _recipient_errors(chunk, response):
+    """Map each number to None (accepted) or an error string."""
+    recipients = response.get("SMSMessageData", {}).get("Recipients", [])
+    by_number = {r.get("number"): r for r in recipients}
+    if len(recipients) == len(chunk) and not all(n in by_number for n in chunk):
+        # Gateway normalised the numbers; statuses come back in request order
+        by_number = dict(zip(chunk, recipients))
+
+    errors = {}
+    for number in chunk:
+        status = by_number.get(number)
+        if status is None:
+            errors[number] = "No delivery status returned"
+        elif int(status.get("statusCode", 0)) >= 200:
+            errors[number] = status.get("status") or "Rejected"
+        else:
+            errors[number] = None
+    return errors
+
+
+def send_bulk_sms(message, phone_numbers, batch_size=SMS_BATCH_SIZE):
+    """
+    Send one message body to many numbers, `batch_size` recipients per
+    API call. Returns {number: None on success, else error string}.
+    """
+    numbers = list(dict.fromkeys(phone_numbers))
+    sms = get_sms_service()
+    results = {}
+
+    for start in range(0, len(numbers), batch_size):
+        chunk = numbers[start:start + batch_size]
+        try:
+            response = sms.send(message, chunk)
+            results.update(_recipient_errors(chunk, response))
+        except Exception as e:
+            results.update({number: str(e) for number in chunk})
+
+    return results
+
+
 def send_sms_africastalking(phone_number, message):
     try:
-        africastalking.initialize(
-            settings.AFRICASTALKING_USERNAME,
-            settings.AFRICASTALKING_API_KEY
-        )
-        sms = africastalking.SMS
-        response = sms.send(message, [phone_number])
-        return response
+        error = send_bulk_sms(message, [phone_number])[phone_number]
+        if error:
+            return {"error": error}
+        return {"status": "sent", "to": phone_number}
     except Exception as e:
         return {"error": str(e)}
 
+# Email
+# Messages sent per SMTP session before reconnecting
+EMAIL_BATCH_SIZE = getattr(settings, "EMAIL_BATCH_SIZE", 100)
+
+
+def build_email(recipient, subject, message):
+    return EmailMessage(
+        subject=subject,
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+    )
+
+
+def send_bulk_email(messages, batch_size=EMAIL_BATCH_SIZE, **connection_kwargs):
+    """
+    Send EmailMessages over one backend connection per `batch_size`
+    messages instead of one per message.
+    Returns a list with None or the error string for each message, in order.
+    """
+    errors = []
+    for start in range(0, len(messages), batch_size):
+        chunk = messages[start:start + batch_size]
+        connection = get_connection(fail_silently=False, **connection_kwargs)
+
+        try:
+            connection.open()
+        except Exception as e:
+            errors.extend([str(e)] * len(chunk))
+            continue
+
+        try:
+            # One call per message keeps failures per recipient; the
+            # connection stays open between calls.
+            for message in chunk:
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    errors.append(str(e))
+                else:
+                    errors.append(None)
+        finally:
+            connection.close()
+
+    return errors
+
+
 def send_email(recipient, subject, message):
     try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,  # safer than None
-            [recipient],
-            fail_silently=False,
-        )
+        error = send_bulk_email([build_email(recipient, subject, message)])[0]
+        if error:
+            return {"error": error}
         return {"status": "sent", "to": recipient}
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
@@ -0,0 +1,58 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+
+def wants_cursor(request):
+    """
+    Clients opt into keyset pages with ?pagination=cursor.
+    Follow-up pages carry a `cursor` param in their next/previous links.
+    """
+    params = request.query_params
+    return params.get("pagination") == "cursor" or "cursor" in params
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """
+    Keyset pages on (created_at, id), newest first.
+    No COUNT(*) and no OFFSET, so page 10,000 costs the same as page 1.
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class OldestFirstCursorPagination(NewestFirstCursorPagination):
+    """Keyset pages on (created_at, id) in conversation order."""
+    ordering = ("created_at", "id")
+
+
+class FeedPagination(BasePagination):
+    """
+    Page numbers by default, keyset pages on request.
+    Keeps existing page-number clients working while deep scrollers
+    switch to `?pagination=cursor`.
+    """
+    cursor_class = NewestFirstCursorPagination
+    page_number_class = PageNumberPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if wants_cursor(request):
+            self.paginator = self.cursor_class()
+        else:
+            self.paginator = self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.page_number_class().get_schema_operation_parameters(view)
+            + self.cursor_class().get_schema_operation_parameters(view)
+        )
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import threading
+
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastDispatcher:
+    """
+    Sends channel-layer group messages from a background event loop.
+
+    Request threads only enqueue; a single drain task empties the queue
+    and fans out each batch concurrently, so request latency does not
+    depend on the channel layer or on how many sockets are subscribed.
+
+    The drain task normally runs on a private loop in a daemon thread.
+    InMemoryChannelLayer only wakes a waiting receiver for sends made on
+    the receiver's own loop, so with that layer the task runs on the ASGI
+    server loop instead, attached by the first socket that connects.
+    """
+
+    def __init__(self, batch_size=100):
+        self.batch_size = batch_size
+        self._loop = None
+        self._queue = None
+        self._lock = threading.Lock()
+        self._in_process = None
+        self._task = None
+
+    def in_process_layer(self):
+        if self._in_process is None:
+            self._in_process = isinstance(get_channel_layer(), InMemoryChannelLayer)
+        return self._in_process
+
+    def attach(self, loop):
+        """Run the drain task on `loop`; call from a consumer running on it."""
+        if self._attached(loop) or not self.in_process_layer():
+            return
+        with self._lock:
+            if not self._attached(loop):
+                self._queue = asyncio.Queue()
+                self._loop = loop
+                self._task = loop.create_task(self._drain())
+
+    def _attached(self, loop):
+        return self._loop is loop and not loop.is_closed()
+
+    def _start(self):
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            ready.set()
+            loop.run_until_complete(self._drain())
+
+        threading.Thread(target=run, name="ws-broadcast", daemon=True).start()
+        ready.wait()
+
+    async def _drain(self):
+        channel_layer = get_channel_layer()
+
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            results = await asyncio.gather(
+                *(channel_layer.group_send(group, event) for group, event in batch),
+                return_exceptions=True,
+            )
+            for (group, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.warning("Broadcast to %s failed: %s", group, result)
+
+    def send(self, group, event):
+        if self._loop is None or self._loop.is_closed():
+            if self.in_process_layer():
+                return  # No socket is connected to this process
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (group, event))
+
+
+dispatcher = BroadcastDispatcher()
+
+
+def broadcast(group, event):
+    """
+    Queue a group_send for after the current transaction commits.
+    Nothing is sent if the transaction rolls back.
+    """
+    transaction.on_commit(lambda: dispatcher.send(group, event))
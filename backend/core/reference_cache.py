@@ -0,0 +1,110 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+from backend.core.models import ReferenceVersion
+
+REFERENCE_CACHE_SECONDS = getattr(settings, "REFERENCE_CACHE_SECONDS", 60 * 60)
+
+
+def get_version(namespace):
+    """
+    Current version stamp of a namespace. Stamps live in the database, so
+    every worker sees a bump as soon as it commits.
+    """
+    version = (
+        ReferenceVersion.objects.filter(namespace=namespace)
+        .values_list("version", flat=True).first()
+    )
+    if version is None:
+        version = ReferenceVersion.objects.get_or_create(
+            namespace=namespace, defaults={"version": time.time_ns()}
+        )[0].version
+    return version
+
+
+def set_version(namespace):
+    """
+    Stamp `namespace` with a new version now and return it. Stamps are
+    nanosecond times that never go backwards, so Last-Modified only
+    moves forward even if worker clocks disagree.
+    """
+    with transaction.atomic():
+        updated = ReferenceVersion.objects.filter(namespace=namespace).update(
+            version=Greatest(F("version") + 1, Value(time.time_ns()))
+        )
+        if not updated:
+            ReferenceVersion.objects.get_or_create(
+                namespace=namespace, defaults={"version": time.time_ns()}
+            )
+        return get_version(namespace)
+
+
+def bump_version(namespace):
+    """
+    Invalidate every cached response in `namespace` once the current
+    transaction commits, so no request can re-cache the old rows under
+    the new version.
+    """
+    transaction.on_commit(lambda: set_version(namespace))
+
+
+class CachedReadMixin:
+    """
+    Serve list / retrieve from cached JSON bytes.
+
+    Entries are keyed by `cache_namespace`, its version stamp and the
+    full request path, so a save or delete anywhere in the namespace
+    (see signals.py) makes every cached page miss at once. The same
+    key is the ETag: a matching If-None-Match gets a 304 after one
+    version lookup, without reading the body. Bodies are keyed by the
+    database version, so even a per-process cache never serves an old
+    one. Only responses that are the same for every caller belong here.
+    """
+    cache_namespace = None
+
+    def cached_response(self, request, build):
+        if request.accepted_renderer.format != "json":
+            return build()
+
+        version = get_version(self.cache_namespace)
+        digest = hashlib.sha1(
+            f"{self.cache_namespace}:{version}:{request.get_full_path()}".encode()
+        ).hexdigest()
+        etag = f'"{digest}"'
+        last_modified = version // 1_000_000_000
+
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+
+        key = f"refdata:{self.cache_namespace}:{digest}"
+        body = cache.get(key)
+        if body is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+            body = JSONRenderer().render(response.data)
+            cache.set(key, body, REFERENCE_CACHE_SECONDS)
+
+        response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedReadMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedReadMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+from backend.core.models import ReportJob, Ticket
+
+logger = logging.getLogger(__name__)
+
+VALID_STATUSES = ["open", "in_progress", "resolved"]
+VALID_CATEGORIES = ["grants", "training", "startup", "incident"]
+
+# A finished report is reused for identical filters for this long
+REPORT_CACHE_TTL = timedelta(minutes=getattr(settings, "REPORT_CACHE_MINUTES", 15))
+# A queued job not started, or a running job without a heartbeat, for this
+# long is assumed lost with its worker process
+REPORT_STALE_AFTER = timedelta(minutes=getattr(settings, "REPORT_STALE_MINUTES", 5))
+
+PDF_COLUMNS = ["ID", "Title", "Category", "Status", "Youth", "Officer", "Escalation", "Deadline"]
+PDF_ROWS_PER_PAGE = 35
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "REPORT_WORKERS", 2),
+    thread_name_prefix="report",
+)
+
+
+# =========================
+# FILTERS
+# =========================
+def clean_filters(params):
+    """
+    Keep only valid filter values from a query-param mapping.
+    Equivalent requests normalise to the same dict (and cache key).
+    """
+    def parse_date(date_str):
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d").date().isoformat()
+        except (ValueError, TypeError):
+            return None
+
+    filters = {
+        "start_date": parse_date(params.get("start_date")),
+        "end_date": parse_date(params.get("end_date")),
+        "status": params.get("status") if params.get("status") in VALID_STATUSES else None,
+        "category": params.get("category") if params.get("category") in VALID_CATEGORIES else None,
+    }
+    return {key: value for key, value in filters.items() if value}
+
+
+def filter_tickets(filters):
+    qs = Ticket.objects.all()
+
+    if "start_date" in filters:
+        qs = qs.filter(created_at__date__gte=filters["start_date"])
+    if "end_date" in filters:
+        qs = qs.filter(created_at__date__lte=filters["end_date"])
+    if "status" in filters:
+        qs = qs.filter(status=filters["status"])
+    if "category" in filters:
+        qs = qs.filter(category=filters["category"])
+
+    return qs
+
+
+def filters_hash(filters):
+    return hashlib.sha256(
+        json.dumps(filters, sort_keys=True).encode()
+    ).hexdigest()
+
+
+# =========================
+# PDF RENDERING
+# =========================
+def _pdf_rows(tickets):
+    rows = tickets.order_by("id").values_list(
+        "id", "title", "category", "status", "youth__username",
+        "officer__username", "escalation_level", "sla_deadline",
+    )
+    for pk, title, category, status, youth, officer, level, deadline in rows.iterator(chunk_size=2000):
+        yield [
+            pk,
+            title[:45],
+            category,
+            status,
+            youth or "",
+            officer or "",
+            f"L{level}",
+            deadline.strftime("%Y-%m-%d %H:%M") if deadline else "",
+        ]
+
+
+def _draw_page(pdf, rows, page_number):
+    width, height = landscape(A4)
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(40, height - 40, "Tickets Report")
+    pdf.setFont("Helvetica", 9)
+    pdf.drawRightString(width - 40, 25, f"Page {page_number}")
+
+    table = Table([PDF_COLUMNS] + rows, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 9),
+        ("FONT", (0, 1), (-1, -1), "Helvetica", 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ]))
+    _, table_height = table.wrapOn(pdf, width - 80, height - 100)
+    table.drawOn(pdf, 40, height - 60 - table_height)
+    pdf.showPage()
+
+
+def render_tickets_pdf(tickets, output, on_progress=None):
+    """
+    Write a paginated table of `tickets` to the file-like `output`.
+    Rows are read from the database in chunks, one page drawn at a time.
+    `on_progress(done, total)` is called after every page.
+    """
+    total = tickets.count()
+    pdf = canvas.Canvas(output, pagesize=landscape(A4))
+
+    done, page_number, page = 0, 1, []
+    for row in _pdf_rows(tickets):
+        page.append(row)
+        if len(page) == PDF_ROWS_PER_PAGE:
+            _draw_page(pdf, page, page_number)
+            done += len(page)
+            page_number += 1
+            page = []
+            if on_progress:
+                on_progress(done, total)
+
+    if page or page_number == 1:
+        _draw_page(pdf, page, page_number)
+        done += len(page)
+        if on_progress:
+            on_progress(done, total)
+
+    pdf.save()
+
+
+# =========================
+# BACKGROUND JOBS
+# =========================
+def fail_stale_jobs(jobs):
+    """
+    Mark jobs in `jobs` whose worker has gone quiet as failed, so they
+    are neither reused nor polled forever. Returns the number marked.
+    """
+    cutoff = timezone.now() - REPORT_STALE_AFTER
+    return jobs.filter(
+        Q(status="pending", created_at__lt=cutoff)
+        | Q(status="running", heartbeat_at__lt=cutoff)
+    ).update(
+        status="failed",
+        error="Report worker stopped before the report finished",
+        finished_at=timezone.now(),
+    )
+
+
+def submit_report(filters, user):
+    """
+    Return a job for `filters`, reusing a live queued or running job, or
+    a recently finished one, for the same filter set.
+    """
+    key = filters_hash(filters)
+    fail_stale_jobs(ReportJob.objects.filter(filters_hash=key))
+
+    cached = (
+        ReportJob.objects
+        .filter(
+            Q(status__in=["pending", "running"])
+            | Q(status="done", finished_at__gte=timezone.now() - REPORT_CACHE_TTL),
+            filters_hash=key,
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if cached:
+        return cached
+
+    job = ReportJob.objects.create(
+        requested_by=user,
+        filters=filters,
+        filters_hash=key,
+    )
+    transaction.on_commit(lambda: _executor.submit(run_report_job, job.id))
+    return job
+
+
+def run_report_job(job_id):
+    close_old_connections()
+    try:
+        # Claim the job; one already failed as stale is left alone
+        claimed = ReportJob.objects.filter(id=job_id, status="pending").update(
+            status="running", heartbeat_at=timezone.now()
+        )
+        if not claimed:
+            return
+        job = ReportJob.objects.get(id=job_id)
+
+        def on_progress(done, total):
+            percent = int(done * 100 / total) if total else 100
+            ReportJob.objects.filter(id=job_id, status="running").update(
+                progress=min(percent, 99), heartbeat_at=timezone.now()
+            )
+
+        with tempfile.TemporaryFile() as output:
+            render_tickets_pdf(filter_tickets(job.filters), output, on_progress)
+            output.seek(0)
+            job.file.save(f"tickets_report_{job.id}.pdf", File(output), save=False)
+
+        job.status = "done"
+        job.progress = 100
+        job.finished_at = timezone.now()
+        job.save(update_fields=["file", "status", "progress", "finished_at"])
+    except Exception as e:
+        logger.exception("Report job %s failed", job_id)
+        ReportJob.objects.filter(id=job_id).update(
+            status="failed", error=str(e), finished_at=timezone.now()
+        )
+    finally:
+        close_old_connections()
@@ -0,0 +1,227 @@
+from collections import Counter
+from datetime import datetime, time
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from backend.core.models import Feedback, FeedbackRollup, Ticket, TicketRollup
+
+
+def _bump(model, key, **deltas):
+    """Add `deltas` to the rollup row identified by `key`, creating it if needed."""
+    increments = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**key).update(**increments):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        # A concurrent writer created the row first; add to theirs
+        model.objects.filter(**key).update(**increments)
+
+
+def bucket(created_at, lga, status, escalation_level, officer_id, sla_breached):
+    return {
+        "day": timezone.localdate(created_at),
+        "status": status,
+        "escalation_level": escalation_level,
+        "sla_breached": sla_breached,
+        "lga": lga,
+        "officer_id": officer_id,
+    }
+
+
+def ticket_bucket(ticket, values):
+    return bucket(
+        ticket.created_at,
+        values["lga"],
+        values["status"],
+        values["escalation_level"],
+        values["officer_id"],
+        values["sla_breached"],
+    )
+
+
+def ticket_changed(ticket, before, after):
+    """
+    Move a ticket between rollup buckets.
+    `before` / `after` are tracked values, None for a ticket that was just
+    created / deleted.
+    """
+    old = ticket_bucket(ticket, before) if before else None
+    new = ticket_bucket(ticket, after) if after else None
+
+    if old == new:
+        return
+    if old:
+        _bump(TicketRollup, old, count=-1)
+    if new:
+        _bump(TicketRollup, new, count=+1)
+
+
+def officer_deleted(officer_id):
+    """
+    Fold a deleted officer's rows into the unassigned buckets, where
+    SET_NULL moves their tickets. Run before the delete, so nulling the
+    officer column can't collide with an existing unassigned bucket.
+    """
+    rows = TicketRollup.objects.filter(officer_id=officer_id)
+    for row in list(rows):
+        unassigned = {
+            "day": row.day,
+            "status": row.status,
+            "escalation_level": row.escalation_level,
+            "sla_breached": row.sla_breached,
+            "lga": row.lga,
+            "officer_id": None,
+        }
+        _bump(TicketRollup, unassigned, count=row.count)
+    rows.delete()
+
+
+def youth_lga_changed(youth_id, lga):
+    """Move a youth's tickets, and their rollup counts, to their new LGA."""
+    with transaction.atomic():
+        tickets = Ticket.objects.filter(youth_id=youth_id).exclude(lga=lga)
+        rows = list(
+            tickets.select_for_update().values_list(
+                "created_at", "lga", "status", "escalation_level", "officer_id", "sla_breached",
+            )
+        )
+        if not rows:
+            return
+
+        tickets.update(lga=lga)
+        move_tickets([
+            (
+                bucket(created_at, old_lga, status, level, officer_id, breached),
+                bucket(created_at, lga, status, level, officer_id, breached),
+            )
+            for created_at, old_lga, status, level, officer_id, breached in rows
+        ])
+
+
+def move_tickets(moves):
+    """
+    Apply (old bucket, new bucket) moves for tickets changed by bulk
+    UPDATEs, which bypass signals. One write per distinct bucket.
+    """
+    deltas = Counter()
+    for old, new in moves:
+        deltas[tuple(old.items())] -= 1
+        deltas[tuple(new.items())] += 1
+
+    for key, delta in deltas.items():
+        if delta:
+            _bump(TicketRollup, dict(key), count=delta)
+
+
+def feedback_changed(feedback, before, after):
+    day = timezone.localdate(feedback.created_at)
+    old_rating = before["rating"] if before else 0
+    new_rating = after["rating"] if after else 0
+    count = (after is not None) - (before is not None)
+
+    if count or old_rating != new_rating:
+        _bump(FeedbackRollup, {"day": day}, count=count, rating_sum=new_rating - old_rating)
+
+
+def rebuild_rollups():
+    """Recompute every rollup row from the ticket and feedback tables."""
+    TicketRollup.objects.all().delete()
+    FeedbackRollup.objects.all().delete()
+
+    ticket_rows = (
+        Ticket.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "status", "escalation_level", "sla_breached", "lga", "officer")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    TicketRollup.objects.bulk_create(
+        (
+            TicketRollup(
+                day=row["day"],
+                status=row["status"],
+                escalation_level=row["escalation_level"],
+                sla_breached=row["sla_breached"],
+                lga=row["lga"],
+                officer_id=row["officer"],
+                count=row["count"],
+            )
+            for row in ticket_rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+    feedback_rows = (
+        Feedback.objects.annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(count=Count("id"), rating_sum=Sum("rating"))
+        .order_by()
+    )
+    FeedbackRollup.objects.bulk_create(
+        FeedbackRollup(**row) for row in feedback_rows
+    )
+
+
+def ticket_summary():
+    """
+    Fold the rollups into dashboard totals.
+    One grouped query over TicketRollup, rolled up to months in the
+    database so the row count stays small.
+    """
+    rows = (
+        TicketRollup.objects.annotate(month=TruncMonth("day"))
+        .values("month", "status", "escalation_level", "sla_breached", "lga", "officer__username")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+        .order_by()
+    )
+
+    by_status = {"open": 0, "in_progress": 0, "resolved": 0}
+    sla_breaches = 0
+    by_level = {1: 0, 2: 0, 3: 0}
+    by_lga, by_officer, by_month = {}, {}, {}
+
+    for row in rows:
+        total = row["total"]
+        by_status[row["status"]] = by_status.get(row["status"], 0) + total
+        by_level[row["escalation_level"]] = by_level.get(row["escalation_level"], 0) + total
+        by_lga[row["lga"]] = by_lga.get(row["lga"], 0) + total
+        by_officer[row["officer__username"]] = by_officer.get(row["officer__username"], 0) + total
+        by_month[row["month"]] = by_month.get(row["month"], 0) + total
+        if row["sla_breached"] and row["status"] in Ticket.ACTIVE_STATUSES:
+            sla_breaches += total
+
+    return {
+        "total": sum(by_status.values()),
+        "status": by_status,
+        "escalation": {f"L{level}": count for level, count in by_level.items()},
+        "sla_breaches": sla_breaches,
+        "lga_distribution": [
+            {"youth__lga": lga, "count": count}
+            for lga, count in sorted(by_lga.items(), key=lambda item: -item[1])
+        ],
+        "officer_performance": [
+            {"officer__username": username, "count": count}
+            for username, count in sorted(by_officer.items(), key=lambda item: -item[1])
+        ],
+        "tickets_per_month": [
+            # Midnight on the 1st, as TruncMonth("created_at") returned
+            {"month": timezone.make_aware(datetime.combine(month, time.min)), "count": count}
+            for month, count in sorted(by_month.items())
+        ],
+    }
+
+
+def feedback_summary():
+    totals = FeedbackRollup.objects.aggregate(count=Sum("count"), rating_sum=Sum("rating_sum"))
+    count = totals["count"] or 0
+
+    return {
+        "average_rating": totals["rating_sum"] / count if count else None,
+        "total_feedback": count,
+    }
@@ -0,0 +1,241 @@
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from backend.core.models import KnowledgeBase
+from backend.core.reference_cache import get_version
+
+logger = logging.getLogger(__name__)
+
+# Search objects created by migration 0038 (vendor specific)
+KB_TABLE = "core_knowledgebase"
+KB_FTS_TABLE = "core_knowledgebase_fts"  # SQLite FTS5 index
+PG_TSQUERY = "websearch_to_tsquery('english', %s)"
+
+
+def _fts5_query(query):
+    """Quote each word so user input can't use FTS5 operators; words are ANDed."""
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", query))
+
+
+def search_knowledge_base(queryset, query):
+    """
+    Filter KnowledgeBase rows matching `query` in title or content and
+    order them by relevance (annotated as `rank`, higher is better).
+    Title matches weigh more than content matches.
+    """
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        matches = RawSQL(
+            f"{KB_TABLE}.search_vector @@ {PG_TSQUERY}",
+            (query,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank_cd({KB_TABLE}.search_vector, {PG_TSQUERY})",
+            (query,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(rank=rank).order_by("-rank", "-id")
+
+    if vendor == "sqlite":
+        match = _fts5_query(query)
+        if not match:
+            return queryset.none()
+
+        # Joined rather than a correlated subquery, so MATCH runs once;
+        # bm25() is lower-is-better, so negate it to match Postgres.
+        return queryset.extra(
+            tables=[KB_FTS_TABLE],
+            where=[
+                f"{KB_FTS_TABLE}.rowid = {KB_TABLE}.id",
+                f"{KB_FTS_TABLE} MATCH %s",
+            ],
+            params=[match],
+            select={"rank": f"-bm25({KB_FTS_TABLE}, 10.0, 1.0)"},
+        ).order_by("-rank", "-id")
+
+    # No full-text index on other backends: unranked substring match
+    return queryset.filter(Q(title__icontains=query) | Q(content__icontains=query))
+
+
+# =========================
+# SUGGESTIONS (in-memory BM25)
+# =========================
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from have how i if in is it "
+    "me my no not of on or so that the this to was we what when where which "
+    "who why will with you your".split()
+)
+TITLE_BOOST = 3          # title terms count this many times
+MAX_QUERY_TERMS = 32     # rarest draft terms kept; bounds the cost of long drafts
+INDEX_MAX_AGE = 600      # seconds; full rebuild at least this often
+
+
+def tokenize(text):
+    return [
+        token for token in re.findall(r"[a-z0-9]+", (text or "").lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over knowledge base articles, held in process memory.
+
+    Saves and deletes committed in this process update it in place (see
+    signals.py). Changes made by other processes are noticed through the
+    knowledge_base version stamp and trigger a rebuild. Only the first
+    build runs on a request (one request builds, the rest wait for it);
+    later rebuilds run in one background thread while the old index
+    keeps serving.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = {}       # id -> (title, category, length, term counts)
+        self.postings = {}   # term -> {id: term count}
+        self.total_length = 0
+        self.version = None
+        self.built_at = 0.0
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()  # held for the length of a build
+        self._changed_during_build = False
+
+    def _add(self, article):
+        terms = Counter(tokenize(article.title) * TITLE_BOOST + tokenize(article.content))
+        length = sum(terms.values())
+
+        self.docs[article.id] = (article.title, article.category, length, terms)
+        self.total_length += length
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[article.id] = count
+
+    def _remove(self, article_id):
+        doc = self.docs.pop(article_id, None)
+        if doc is None:
+            return
+        _, _, length, terms = doc
+        self.total_length -= length
+        for term in terms:
+            posting = self.postings[term]
+            del posting[article_id]
+            if not posting:
+                del self.postings[term]
+
+    def rebuild(self, version):
+        # Built aside and swapped in, so searches only wait for the swap
+        self._changed_during_build = False
+        fresh = BM25Index(self.k1, self.b)
+        articles = KnowledgeBase.objects.only("id", "title", "content", "category")
+        for article in articles.iterator(chunk_size=500):
+            fresh._add(article)
+
+        with self._lock:
+            self.docs, self.postings = fresh.docs, fresh.postings
+            self.total_length = fresh.total_length
+            # An article saved mid-build may be missing from the snapshot
+            self.version = None if self._changed_during_build else version
+            self.built_at = time.monotonic()
+
+    def _rebuild_in_background(self, version):
+        if not self._build_lock.acquire(blocking=False):
+            return  # Already rebuilding
+
+        def run():
+            try:
+                self.rebuild(version)
+            except Exception:
+                logger.exception("Rebuilding the knowledge base index failed")
+            finally:
+                self._build_lock.release()
+                connections.close_all()
+
+        threading.Thread(target=run, name="kb-index", daemon=True).start()
+
+    def article_changed(self, article_id, previous, version):
+        """
+        Apply one committed save / delete and adopt the new version.
+        If the index was behind `previous` (another process changed
+        articles too), drop it for a full rebuild instead.
+        """
+        if self.version != previous:
+            self.version = None
+            return
+
+        article = (
+            KnowledgeBase.objects.only("id", "title", "content", "category")
+            .filter(id=article_id).first()
+        )
+        with self._lock:
+            self._remove(article_id)
+            if article is not None:
+                self._add(article)
+            self.version = version
+            if self._build_lock.locked():
+                self._changed_during_build = True
+
+    def sync(self):
+        version = get_version("knowledge_base")
+        if version == self.version and time.monotonic() - self.built_at <= INDEX_MAX_AGE:
+            return
+
+        if not self.built_at:
+            # Nothing to serve yet: build now, once
+            with self._build_lock:
+                if not self.built_at:
+                    self.rebuild(version)
+            return
+
+        self._rebuild_in_background(version)
+
+    def search(self, text, k=5, category=None):
+        """Top `k` (article id, title, category, score), best first."""
+        self.sync()
+
+        with self._lock:
+            count = len(self.docs)
+            if not count:
+                return []
+            avg_length = self.total_length / count
+
+            def idf(term):
+                df = len(self.postings[term])
+                return math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+            terms = [term for term in set(tokenize(text)) if term in self.postings]
+            terms = sorted(terms, key=idf, reverse=True)[:MAX_QUERY_TERMS]
+
+            scores = defaultdict(float)
+            for term in terms:
+                weight = idf(term)
+                for article_id, tf in self.postings[term].items():
+                    length = self.docs[article_id][2]
+                    scores[article_id] += weight * tf * (self.k1 + 1) / (
+                        tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    )
+
+            if category:
+                scores = {
+                    article_id: score for article_id, score in scores.items()
+                    if self.docs[article_id][1] == category
+                }
+
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                (article_id, self.docs[article_id][0], self.docs[article_id][1], score)
+                for article_id, score in best
+            ]
+
+
+kb_index = BM25Index()
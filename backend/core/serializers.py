@@ -1,5 +1,12 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from .models import User, Ticket, KnowledgeBase, Feedback, Notification, TicketNote, Poll, PollOption, MinistryInfo, OfficerRole, Program, Workflow, EscalationMatrix, YouthProfile, DocumentUpload, TicketMessage, Application, ProgramApplication, YouthHubCategory
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .authentication import get_cached_user
+from .token_denylist import deny, is_denied
+from .models import User, Ticket, KnowledgeBase, Feedback, Notification, TicketNote, Poll, PollOption, MinistryInfo, OfficerRole, Program, Workflow, EscalationMatrix, YouthProfile, DocumentUpload, TicketMessage, Application, ProgramApplication, YouthHubCategory, ReportJob
 from django.contrib.auth import get_user_model
 
 
@@ -120,6 +127,7 @@ class TicketSerializer(serializers.ModelSerializer):
             'youth_name',
             'officer',
             'officer_name',
+            'duplicate_of',
             "messages",
             "internal_notes",
         ]
@@ -130,15 +138,98 @@ class TicketSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
             'youth',
+            'duplicate_of',
         ]
 
 
+class TicketListSerializer(serializers.ModelSerializer):
+    """
+    Collection view of a ticket: no nested conversation.
+    Expects `message_count` and `last_activity` annotations.
+    """
+    youth_name = serializers.CharField(source="youth.username", read_only=True)
+    officer_name = serializers.CharField(source="officer.username", read_only=True)
+    message_count = serializers.IntegerField(read_only=True)
+    last_activity = serializers.DateTimeField(read_only=True)
+
+    class Meta:
+        model = Ticket
+        fields = [
+            'id',
+            'title',
+            'category',
+            'status',
+            'escalation_level',
+            'sla_deadline',
+            'created_at',
+            'youth',
+            'youth_name',
+            'officer',
+            'officer_name',
+            'duplicate_of',
+            'message_count',
+            'last_activity',
+        ]
+        read_only_fields = fields
+
+
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'user', 'message', 'created_at', 'is_read']
         read_only_fields = ['user', 'created_at']
 
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'filters', 'status', 'progress', 'error', 'created_at', 'finished_at', 'download_url']
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != "done":
+            return None
+        return f"/api/tickets/export/pdf/jobs/{obj.id}/download/"
+
+
+class DenylistTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh with the jti denylist instead of the token_blacklist app.
+    The user comes from the JWT user cache, so a refresh needs no query
+    when the cache is warm.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        if user_id:
+            user = get_cached_user(user_id)
+            if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"],
+                    "no_active_account",
+                )
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS and jwt_settings.BLACKLIST_AFTER_ROTATION:
+            # Spend the old token first: a replayed or concurrent refresh loses
+            if not deny(refresh[jwt_settings.JTI_CLAIM], refresh["exp"]):
+                raise TokenError(_("Token is blacklisted"))
+        elif is_denied(refresh[jwt_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+        data = {"access": str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 class PollOptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = PollOption
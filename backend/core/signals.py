@@ -0,0 +1,171 @@
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from backend.core import rollups, unread, workload
+from backend.core.authentication import forget_user
+from backend.core.utils import flush_request_buffers
+from backend.core.models import (
+    EscalationMatrix,
+    Feedback,
+    KnowledgeBase,
+    MinistryInfo,
+    Notification,
+    OfficerRole,
+    OfficerWorkload,
+    Program,
+    Ticket,
+    TicketMessage,
+    TicketNote,
+    User,
+    Workflow,
+    YouthHubCategory,
+)
+from backend.core.reference_cache import bump_version, get_version, set_version
+from backend.core.search import kb_index
+
+
+def _unread_delta(instance, created):
+    """+1 for a new unread row, -1 / +1 when is_read flips, else 0."""
+    before = instance.loaded_values()
+    instance.snapshot_tracked_fields()
+    if created:
+        return 0 if instance.is_read else 1
+    if before is None or before["is_read"] == instance.is_read:
+        return 0
+    return -1 if instance.is_read else 1
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, **kwargs):
+    before = None if created else instance.loaded_values()
+    if created or before is not None:
+        after = instance.tracked_values()
+        workload.ticket_changed(before, after)
+        rollups.ticket_changed(instance, before, after)
+    if before is not None:
+        unread.ticket_reassigned(instance, before["officer_id"], instance.officer_id)
+    instance.snapshot_tracked_fields()
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    before = instance.loaded_values()
+    if before is not None:
+        workload.ticket_changed(before, None)
+        rollups.ticket_changed(instance, before, None)
+
+
+@receiver(post_save, sender=Feedback)
+def feedback_saved(sender, instance, created, **kwargs):
+    before = None if created else instance.loaded_values()
+    if created or before is not None:
+        rollups.feedback_changed(instance, before, instance.tracked_values())
+    instance.snapshot_tracked_fields()
+
+
+@receiver(post_delete, sender=Feedback)
+def feedback_deleted(sender, instance, **kwargs):
+    before = instance.loaded_values()
+    if before is not None:
+        rollups.feedback_changed(instance, before, None)
+
+
+@receiver(post_save, sender=TicketMessage)
+def ticket_message_saved(sender, instance, created, **kwargs):
+    delta = _unread_delta(instance, created)
+    if delta:
+        unread.bump(instance.recipient_id(), ticket_messages=delta)
+
+
+@receiver(post_delete, sender=TicketMessage)
+def ticket_message_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        unread.bump(instance.recipient_id(), ticket_messages=-1)
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    unread.bump(instance.user_id, notifications=_unread_delta(instance, created))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        unread.bump(instance.user_id, notifications=-1)
+
+
+@receiver(post_save, sender=User)
+def officer_saved(sender, instance, **kwargs):
+    if instance.role == "officer":
+        OfficerWorkload.objects.get_or_create(officer=instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    before = None if created else instance.loaded_values()
+    if before is not None and before["lga"] != instance.lga:
+        rollups.youth_lga_changed(instance.pk, instance.lga)
+    instance.snapshot_tracked_fields()
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    # Before SET_NULL clears the officer column on their rollup rows
+    rollups.officer_deleted(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Role / active changes must reach the cached JWT user
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=TicketNote)
+def note_saved(sender, instance, created, **kwargs):
+    # An edit changes neither note count nor times; touch the ticket so
+    # its detail ETag changes.
+    if not created:
+        Ticket.objects.filter(pk=instance.ticket_id).update(updated_at=timezone.now())
+
+
+# Cached reference data: nested rows invalidate their parent's namespace.
+# KnowledgeBase bumps its own namespace in article_changed below.
+REFERENCE_NAMESPACES = {
+    Program: "programs",
+    Workflow: "workflows",
+    EscalationMatrix: "workflows",
+    MinistryInfo: "ministry",
+    OfficerRole: "ministry",
+    YouthHubCategory: "youth_hub",
+}
+
+
+def reference_data_changed(sender, **kwargs):
+    bump_version(REFERENCE_NAMESPACES[sender])
+
+
+for model in REFERENCE_NAMESPACES:
+    post_save.connect(reference_data_changed, sender=model, dispatch_uid=f"refdata_save_{model.__name__}")
+    post_delete.connect(reference_data_changed, sender=model, dispatch_uid=f"refdata_delete_{model.__name__}")
+
+
+@receiver(post_save, sender=KnowledgeBase)
+@receiver(post_delete, sender=KnowledgeBase)
+def article_changed(sender, instance, **kwargs):
+    # One callback bumps the knowledge_base version and hands it to the
+    # suggestion index, so this process updates in place, not rebuilds.
+    article_id = instance.pk
+
+    def apply():
+        previous = get_version("knowledge_base")
+        kb_index.article_changed(article_id, previous, set_version("knowledge_base"))
+
+    transaction.on_commit(apply)
+
+
+# Buffered audit rows are written once the response is out
+request_finished.connect(flush_request_buffers, dispatch_uid="core_flush_buffers")
@@ -1,38 +1,238 @@
 # from celery import shared_task
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
-from backend.core.models import Ticket, Notification, AuditLog, User
-from backend.core.notifications.utils import (
-    send_whatsapp_doubletick,
-    send_sms_africastalking,
-    send_email,
+from backend.core import rollups
+from backend.core.models import Ticket, Notification, AuditLog, OutboxMessage, User, Workflow
+from backend.core.notifications.outbox import drain_outbox, enqueue_many
+from backend.core.utils import log_action
+from backend.core.duplicates import purge_old_signatures
+from backend.core.token_denylist import purge_expired_tokens
+from backend.core.verification import purge_expired_codes
+
+
+REMINDER_WINDOW = timedelta(hours=24)
+# One shared SMS body, so the outbox can send it as multi-recipient batches
+SMS_REMINDER = (
+    "Reminder: you have a Benue Youth HelpDesk ticket due within 24 hours. "
+    "Log in to follow up."
 )
 
 
-def send_deadline_reminders():
-    """Check tickets nearing deadline and notify youth."""
+def send_deadline_reminders(chunk_size=1000):
+    """
+    Queue reminders for open / in-progress tickets due within 24 hours.
+
+    Works in locked chunks ordered by id. Each reminded ticket gets
+    `reminder_sent_at`, so reruns skip it, and the outbox keys make a
+    retried chunk send nothing twice. Delivery happens in the outbox
+    worker. Returns the number of tickets reminded.
+    """
     now = timezone.now()
-    upcoming_tickets = Ticket.objects.filter(
-        deadline__lte=now + timezone.timedelta(hours=24),
-        status__in=["open", "in_progress"]
+    due = (
+        Ticket.objects
+        .filter(
+            status__in=Ticket.ACTIVE_STATUSES,
+            sla_deadline__lte=now + REMINDER_WINDOW,
+            reminder_sent_at__isnull=True,
+        )
+        .select_related("youth")
+        .order_by("id")
     )
 
-    for ticket in upcoming_tickets:
-        message = f"Reminder: Your ticket '{ticket.title}' is due by {ticket.deadline}."
-        
-        # WhatsApp + SMS
-        if ticket.youth.phone:
-            send_whatsapp_doubletick(ticket.youth.phone, message)
-            send_sms_africastalking(ticket.youth.phone, message)
-
-        # Email
-        if ticket.youth.email:
-            send_email(ticket.youth.email, "Ticket Deadline Reminder", message)
-
-        # Log audit
-        AuditLog.objects.create(
-            user=ticket.youth,
-            action=f"Deadline reminder sent for ticket {ticket.id}"
+    reminded = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            tickets = list(
+                due.filter(id__gt=last_id)
+                .select_for_update(skip_locked=True, of=("self",))[:chunk_size]
+            )
+            if not tickets:
+                break
+
+            outgoing, audit = [], []
+            for ticket in tickets:
+                youth = ticket.youth
+                message = (
+                    f"Reminder: Your ticket '{ticket.title}' is due by "
+                    f"{ticket.sla_deadline:%Y-%m-%d %H:%M}."
+                )
+                key = f"ticket-{ticket.id}-reminder"
+
+                # WhatsApp + SMS
+                if youth.phone:
+                    outgoing.append(OutboxMessage(
+                        channel="whatsapp", recipient=youth.phone, body=message,
+                        idempotency_key=f"{key}-whatsapp",
+                    ))
+                    outgoing.append(OutboxMessage(
+                        channel="sms", recipient=youth.phone, body=SMS_REMINDER,
+                        idempotency_key=f"{key}-sms",
+                    ))
+
+                # Email
+                if youth.email:
+                    outgoing.append(OutboxMessage(
+                        channel="email", recipient=youth.email, body=message,
+                        subject="Ticket Deadline Reminder",
+                        idempotency_key=f"{key}-email",
+                    ))
+
+                audit.append(AuditLog(
+                    user=youth,
+                    ticket=ticket,
+                    action=f"Deadline reminder sent for ticket {ticket.id}",
+                ))
+
+            enqueue_many(outgoing)
+            AuditLog.objects.bulk_create(audit)
+            Ticket.objects.filter(id__in=[t.id for t in tickets]).update(reminder_sent_at=now)
+
+        reminded += len(tickets)
+        last_id = tickets[-1].id
+
+    return reminded
+
+
+# Ticket category -> Workflow.name; other categories follow DEFAULT_WORKFLOW
+CATEGORY_WORKFLOWS = getattr(settings, "TICKET_CATEGORY_WORKFLOWS", {})
+DEFAULT_WORKFLOW = getattr(settings, "TICKET_DEFAULT_WORKFLOW", "inquiry")
+# Used when the category's workflow has not been set up
+DEFAULT_SLA_HOURS = 24
+DEFAULT_TOP_LEVEL = 3
+
+
+def escalation_policies():
+    """Map workflow name -> (sla_hours, highest EscalationMatrix level)."""
+    policies = {}
+    for workflow in Workflow.objects.prefetch_related("escalations"):
+        levels = [step.level for step in workflow.escalations.all()]
+        policies[workflow.name] = (
+            workflow.sla_hours or DEFAULT_SLA_HOURS,
+            max(levels, default=DEFAULT_TOP_LEVEL),
         )
+    return policies
+
+
+def category_policy(policies, category):
+    workflow = CATEGORY_WORKFLOWS.get(category, DEFAULT_WORKFLOW)
+    return policies.get(workflow, (DEFAULT_SLA_HOURS, DEFAULT_TOP_LEVEL))
+
+
+def below_top_level(policies):
+    """
+    Filter for tickets still under their workflow's top level, so the
+    sweep doesn't re-read tickets that can't go any higher.
+    """
+    default_top = category_policy(policies, None)[1]
+    condition = ~Q(category__in=list(CATEGORY_WORKFLOWS)) & Q(escalation_level__lt=default_top)
+    for category in CATEGORY_WORKFLOWS:
+        top_level = category_policy(policies, category)[1]
+        condition |= Q(category=category, escalation_level__lt=top_level)
+    return condition
+
+
+def breach_level(overdue, sla_hours, top_level):
+    """
+    A breached ticket goes to L2, then up one level for every further
+    SLA window it stays overdue, capped at the workflow's top level.
+    """
+    windows = int(overdue / timedelta(hours=sla_hours))
+    return min(2 + windows, top_level)
+
+
+def escalate_sla_breaches(chunk_size=500):
+    """
+    Flag open / in-progress tickets past their SLA as breached and raise
+    their escalation level. Returns the number of tickets escalated.
+
+    Walks breached tickets in (sla_deadline, id) order over the
+    (status, sla_deadline) index, one locked chunk per transaction, so a
+    sweep never holds more than `chunk_size` row locks at a time.
+    """
+    now = timezone.now()
+    policies = escalation_policies()
+    breached = Ticket.objects.filter(
+        Q(sla_breached=False) | below_top_level(policies),
+        status__in=Ticket.ACTIVE_STATUSES,
+        sla_deadline__lt=now,
+    ).order_by("sla_deadline", "id")
+
+    escalated = 0
+    last = None
+    while True:
+        chunk = breached
+        if last:
+            chunk = chunk.filter(
+                Q(sla_deadline__gt=last[0]) | Q(sla_deadline=last[0], id__gt=last[1])
+            )
+
+        with transaction.atomic():
+            rows = list(
+                chunk.select_for_update(of=("self",)).values_list(
+                    "id", "category", "status", "escalation_level",
+                    "sla_deadline", "created_at", "officer_id", "lga", "sla_breached",
+                )[:chunk_size]
+            )
+            if not rows:
+                break
+
+            by_change = defaultdict(list)
+            moves = []
+            for (pk, category, status, level, deadline,
+                 created_at, officer_id, lga, flagged) in rows:
+                sla_hours, top_level = category_policy(policies, category)
+                target = max(level, breach_level(now - deadline, sla_hours, top_level))
+                if target == level and flagged:
+                    continue
+                by_change[(level, target)].append(pk)
+                moves.append((
+                    rollups.bucket(created_at, lga, status, level, officer_id, flagged),
+                    rollups.bucket(created_at, lga, status, target, officer_id, True),
+                ))
+
+            for (level, target), ids in by_change.items():
+                updated = Ticket.objects.filter(id__in=ids).update(
+                    escalation_level=target, sla_breached=True, updated_at=now
+                )
+                if target > level:
+                    escalated += updated
+            rollups.move_tickets(moves)
+
+        last = (rows[-1][4], rows[-1][0])
+
+    return escalated
+
+
+def process_notification_outbox(batch_size=500, max_batches=50):
+    """Drain due outbox messages; returns the number sent."""
+    total = 0
+    for _ in range(max_batches):
+        sent, errors = drain_outbox(batch_size=batch_size)
+        total += sent
+        if sent + errors < batch_size:
+            break
+    return total
+
+
+def purge_verification_codes():
+    """Delete expired account verification codes."""
+    return purge_expired_codes()
+
+
+def purge_denied_tokens():
+    """Delete denylisted refresh tokens that have expired."""
+    return purge_expired_tokens()
+
+
+def purge_ticket_signatures():
+    """Delete duplicate-detection signatures older than the lookup window."""
+    return purge_old_signatures()
 
 
 def send_notification(user_id, message):
@@ -43,11 +243,10 @@ def send_notification(user_id, message):
     return f"Notification created for {user.username}"
 
 
-def log_audit(user_id, action):
-    """Write audit log entry."""
-    user = User.objects.get(id=user_id)
-    AuditLog.objects.create(user=user, action=action)
-    return f"Audit logged: {action} by {user.username}"
+def log_audit(user_id, action, durable=False):
+    """Queue an audit log entry on the buffered writer."""
+    log_action(user_id, action, durable=durable)
+    return f"Audit logged: {action} by user {user_id}"
 
 # Test task (safe to keep for debugging)
 
@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.test import TestCase
+
+from backend.core.models import AuditLog
+from backend.core.utils import BufferedWriter
+
+
+class BufferedWriterTests(TestCase):
+    def setUp(self):
+        self.writer = BufferedWriter(AuditLog, max_size=2, flush_on_request=False)
+        self.addCleanup(BufferedWriter.instances.remove, self.writer)
+
+    def actions(self):
+        return sorted(AuditLog.objects.values_list("action", flat=True))
+
+    def test_full_buffer_is_flushed(self):
+        # Each test runs in a transaction: commit it to queue the row
+        with self.captureOnCommitCallbacks(execute=True):
+            self.writer.add(action="first")
+        self.assertEqual(self.actions(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.writer.add(action="second")
+        self.assertEqual(self.actions(), ["first", "second"])
+
+    def test_rows_wait_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.writer.add(action="first")
+                self.writer.add(action="second")
+                self.assertEqual(self.actions(), [])
+
+        self.assertEqual(self.actions(), ["first", "second"])
+
+    def test_rows_from_rolled_back_transaction_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.writer.add(action="rolled back")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.writer.add(action="kept")
+
+        self.writer.flush()
+        self.assertEqual(self.actions(), ["kept"])
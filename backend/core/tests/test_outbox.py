@@ -0,0 +1,71 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.core.models import OutboxMessage
+from backend.core.notifications import outbox
+
+
+class DrainOutboxTests(TestCase):
+    def setUp(self):
+        outbox.enqueue("whatsapp", "+2348000000001", "hello", key="greeting")
+        self.message = OutboxMessage.objects.get()
+
+    def drain(self, result):
+        with mock.patch.dict(outbox.SENDERS, {"whatsapp": mock.Mock(return_value=result)}):
+            return outbox.drain_outbox()
+
+    def test_repeated_key_is_queued_once(self):
+        outbox.enqueue("whatsapp", "+2348000000001", "hello", key="greeting")
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_delivered_message_is_marked_sent(self):
+        self.assertEqual(self.drain({"ok": True}), (1, 0))
+
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ("sent", 1))
+        self.assertEqual(outbox.drain_outbox(), (0, 0))
+
+    def test_failure_is_retried_with_backoff_then_given_up(self):
+        for attempt in range(1, outbox.MAX_ATTEMPTS + 1):
+            before = timezone.now()
+            self.assertEqual(self.drain({"error": "gateway down"}), (0, 1))
+
+            self.message.refresh_from_db()
+            self.assertEqual(self.message.attempts, attempt)
+            self.assertEqual(self.message.last_error, "gateway down")
+            if attempt < outbox.MAX_ATTEMPTS:
+                self.assertGreaterEqual(self.message.next_attempt_at, before + outbox.backoff(attempt))
+                OutboxMessage.objects.update(next_attempt_at=timezone.now())
+
+        self.assertEqual(self.message.status, "failed")
+
+    def test_rows_being_sent_are_not_claimed_again(self):
+        claimed_meanwhile = []
+
+        def deliver_batch(batch):
+            # Another worker draining while the gateway call is in flight
+            claimed_meanwhile.extend(outbox.claim_batch(10))
+            return {message.id: None for message in batch}
+
+        with mock.patch.object(outbox, "deliver_batch", deliver_batch):
+            self.assertEqual(outbox.drain_outbox(), (1, 0))
+
+        self.assertEqual(claimed_meanwhile, [])
+
+    def test_expired_lease_is_claimed_again(self):
+        [claimed] = outbox.claim_batch(10)
+        self.assertEqual(outbox.claim_batch(10), [])
+
+        OutboxMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        [reclaimed] = outbox.claim_batch(10)
+        self.assertEqual(reclaimed.attempts, 2)
+
+        # The first worker finishes late: the newer claim owns the row
+        self.assertEqual(outbox.record_outcome([claimed], {claimed.id: "timed out"}), (0, 0))
+        self.assertEqual(outbox.record_outcome([reclaimed], {reclaimed.id: None}), (1, 0))
+
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.last_error), ("sent", ""))
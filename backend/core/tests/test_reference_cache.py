@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from backend.core import reference_cache
+from backend.core.models import Program
+
+
+class ReferenceCacheTests(APITestCase):
+    url = "/api/programs/"
+
+    def setUp(self):
+        Program.objects.create(title="Skills", description="d")
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(self.url, **headers)
+
+    def test_etag_is_shared_by_workers(self):
+        etag = self.get()["ETag"]
+
+        # Another worker: same database, nothing in its cache
+        cache.clear()
+        self.assertEqual(self.get(etag).status_code, 304)
+
+    def test_change_invalidates_after_commit(self):
+        etag = self.get()["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Program.objects.create(title="Grants", description="d")
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_version_never_goes_backwards(self):
+        version = reference_cache.get_version("programs")
+
+        with mock.patch.object(reference_cache.time, "time_ns", return_value=1):
+            self.assertEqual(reference_cache.set_version("programs"), version + 1)
@@ -0,0 +1,16 @@
+from rest_framework.test import APITestCase
+
+from backend.core.models import ReportJob, User
+
+
+class SubmitPdfReportTests(APITestCase):
+    def setUp(self):
+        admin = User.objects.create_user("admin", password="x", role="admin")
+        self.client.force_authenticate(admin)
+
+    def test_non_object_body_is_rejected(self):
+        for body in ([{"status": "open"}], "open", 3):
+            response = self.client.post("/api/tickets/export/pdf/jobs/", body, format="json")
+            self.assertEqual(response.status_code, 400, body)
+
+        self.assertFalse(ReportJob.objects.exists())
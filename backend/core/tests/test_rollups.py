@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.core import rollups
+from backend.core.models import Ticket, TicketRollup, User
+
+
+def rollup_rows():
+    return sorted(
+        TicketRollup.objects.filter(count__gt=0).values_list(
+            "status", "escalation_level", "lga", "officer_id", "count"
+        ),
+        key=str,
+    )
+
+
+class TicketRollupTests(TestCase):
+    def setUp(self):
+        self.youth = User.objects.create_user("youth", password="x", role="youth", lga="Gboko")
+        self.officer = User.objects.create_user("officer", password="x", role="officer")
+
+    def create_ticket(self, **fields):
+        return Ticket.objects.create(
+            youth=self.youth, title="t", description="d", category="grants", **fields
+        )
+
+    def test_ticket_changes_move_between_buckets(self):
+        ticket = self.create_ticket(officer=self.officer)
+        self.create_ticket()
+
+        ticket.status = "resolved"
+        ticket.save()
+
+        summary = rollups.ticket_summary()
+        self.assertEqual(summary["total"], 2)
+        self.assertEqual(summary["status"], {"open": 1, "in_progress": 0, "resolved": 1})
+
+        ticket.delete()
+        self.assertEqual(rollups.ticket_summary()["total"], 1)
+
+    def test_incremental_rows_match_rebuild(self):
+        first = self.create_ticket(officer=self.officer)
+        self.create_ticket()
+        first.escalate()
+        first.status = "in_progress"
+        first.save()
+
+        incremental = rollup_rows()
+        rollups.rebuild_rollups()
+        self.assertEqual(rollup_rows(), incremental)
+
+    def test_bucket_with_null_lga_and_officer_is_unique(self):
+        key = rollups.bucket(timezone.now(), None, "open", 1, None, False)
+        TicketRollup.objects.create(**key, count=1)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TicketRollup.objects.create(**key, count=1)
+
+    def test_bump_adds_to_row_created_by_concurrent_writer(self):
+        key = rollups.bucket(timezone.now(), None, "open", 1, None, False)
+        TicketRollup.objects.create(**key, count=1)
+        real_update = QuerySet.update
+        calls = []
+
+        def update_missing_row_once(queryset, **kwargs):
+            # The first UPDATE runs before the other writer's INSERT lands
+            if not calls:
+                calls.append(kwargs)
+                return 0
+            return real_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, "update", update_missing_row_once):
+            rollups._bump(TicketRollup, key, count=2)
+
+        self.assertEqual(list(TicketRollup.objects.values_list("count", flat=True)), [3])
+
+    def test_youth_lga_change_moves_their_tickets(self):
+        self.create_ticket(officer=self.officer)
+        self.create_ticket()
+
+        self.youth.lga = "Otukpo"
+        self.youth.save()
+
+        self.assertEqual(set(Ticket.objects.values_list("lga", flat=True)), {"Otukpo"})
+        self.assertEqual(
+            rollup_rows(),
+            sorted([("open", 1, "Otukpo", None, 1), ("open", 1, "Otukpo", self.officer.id, 1)], key=str),
+        )
+
+    def test_deleting_officer_folds_rows_into_unassigned_bucket(self):
+        self.create_ticket(officer=self.officer)
+        self.create_ticket()
+
+        self.officer.delete()
+
+        self.assertEqual(rollup_rows(), [("open", 1, "Gboko", None, 2)])
+        self.assertEqual(TicketRollup.objects.count(), 1)
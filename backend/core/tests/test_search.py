@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from backend.core import search
+from backend.core.models import KnowledgeBase
+from backend.core.reference_cache import get_version, set_version
+from backend.core.search import BM25Index
+
+
+class BM25IndexTests(TestCase):
+    def setUp(self):
+        self.grant = KnowledgeBase.objects.create(
+            title="Applying for a grant", content="Fill the form at the hub.", category="guide"
+        )
+        self.training = KnowledgeBase.objects.create(
+            title="Training schedule", content="Grant winners get training.", category="faq"
+        )
+        self.index = BM25Index()
+
+    def ids(self, text, **kwargs):
+        return [article_id for article_id, *_ in self.index.search(text, **kwargs)]
+
+    def test_first_search_builds_and_ranks_titles_higher(self):
+        self.assertEqual(self.ids("grant"), [self.grant.id, self.training.id])
+        self.assertEqual(self.ids("grant", category="faq"), [self.training.id])
+        self.assertEqual(self.ids("the"), [])
+
+    def test_change_in_this_process_is_applied_in_place(self):
+        self.index.sync()
+        previous = get_version("knowledge_base")
+
+        self.training.title = "Grant training schedule"
+        self.training.save()
+        self.index.article_changed(self.training.id, previous, set_version("knowledge_base"))
+
+        self.assertEqual(self.index.version, get_version("knowledge_base"))
+        self.assertEqual(self.ids("schedule grant")[0], self.training.id)
+
+        training_id = self.training.id
+        self.training.delete()
+        self.index.article_changed(training_id, self.index.version, set_version("knowledge_base"))
+        self.assertEqual(self.ids("training"), [])
+
+    def test_change_from_another_process_triggers_one_background_rebuild(self):
+        self.index.sync()
+        set_version("knowledge_base")  # another worker saved an article
+
+        self.index.article_changed(self.grant.id, get_version("knowledge_base"), set_version("knowledge_base"))
+        self.assertIsNone(self.index.version)
+
+        with mock.patch.object(search.threading, "Thread") as thread:
+            self.index.sync()
+            self.index.sync()  # the first rebuild is still running
+
+        thread.assert_called_once()
+        self.assertTrue(self.index._build_lock.locked())
+        self.index._build_lock.release()
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.core import rollups, task
+from backend.core.models import EscalationMatrix, Ticket, User, Workflow
+
+
+class EscalateSlaBreachesTests(TestCase):
+    def setUp(self):
+        self.youth = User.objects.create_user("youth", password="x", role="youth", lga="Gboko")
+        workflow = Workflow.objects.create(name="complaint", sla_hours=1)
+        EscalationMatrix.objects.create(workflow=workflow, level=1, target_role="Case Officer")
+        EscalationMatrix.objects.create(workflow=workflow, level=2, target_role="Coordinator")
+
+    def create_ticket(self, category, overdue_hours, **fields):
+        return Ticket.objects.create(
+            youth=self.youth, title="t", description="d", category=category,
+            sla_deadline=timezone.now() - timedelta(hours=overdue_hours), **fields
+        )
+
+    def levels(self, *tickets):
+        return [Ticket.objects.get(pk=ticket.pk).escalation_level for ticket in tickets]
+
+    def test_category_follows_its_workflow_policy(self):
+        # incident -> complaint: 1h windows capped at L2. grants -> application,
+        # which has no Workflow row here: 24h windows up to L3.
+        incident = self.create_ticket("incident", 5)
+        recent_grant = self.create_ticket("grants", 5)
+        old_grant = self.create_ticket("grants", 50)
+
+        self.assertEqual(task.escalate_sla_breaches(), 3)
+        self.assertEqual(self.levels(incident, recent_grant, old_grant), [2, 2, 3])
+
+    def test_sweep_is_idempotent_and_flags_breaches(self):
+        breached = self.create_ticket("incident", 5)
+        on_time = self.create_ticket("incident", -5)
+        self.create_ticket("incident", 5, status="resolved")
+
+        task.escalate_sla_breaches()
+        self.assertEqual(task.escalate_sla_breaches(), 0)
+
+        self.assertEqual(self.levels(breached, on_time), [2, 1])
+        self.assertEqual(
+            list(Ticket.objects.filter(sla_breached=True).values_list("id", flat=True)),
+            [breached.id],
+        )
+        self.assertEqual(rollups.ticket_summary()["sla_breaches"], 1)
+
+    def test_ticket_already_at_top_level_is_flagged_once(self):
+        ticket = self.create_ticket("incident", 5, escalation_level=2)
+
+        self.assertEqual(task.escalate_sla_breaches(), 0)
+        self.assertTrue(Ticket.objects.get(pk=ticket.pk).sla_breached)
+        self.assertEqual(rollups.ticket_summary()["sla_breaches"], 1)
+
+    def test_rollups_match_rebuild_after_sweep(self):
+        self.create_ticket("incident", 5)
+        self.create_ticket("grants", 50)
+        task.escalate_sla_breaches()
+
+        summary = rollups.ticket_summary()
+        rollups.rebuild_rollups()
+        self.assertEqual(rollups.ticket_summary(), summary)
+
+    def test_resolving_breached_ticket_clears_dashboard_count(self):
+        ticket = self.create_ticket("incident", 5)
+        task.escalate_sla_breaches()
+
+        ticket.refresh_from_db()
+        ticket.status = "resolved"
+        ticket.save()
+
+        self.assertEqual(rollups.ticket_summary()["sla_breaches"], 0)
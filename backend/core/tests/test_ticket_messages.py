@@ -0,0 +1,38 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from backend.core.models import Ticket, TicketMessage, User
+
+
+class TicketMessageSyncTests(APITestCase):
+    def setUp(self):
+        self.youth = User.objects.create_user("youth", password="x", role="youth", lga="Gboko")
+        self.ticket = Ticket.objects.create(
+            youth=self.youth, title="t", description="d", category="grants"
+        )
+        TicketMessage.objects.bulk_create(
+            TicketMessage(ticket=self.ticket, sender=self.youth, message=str(i)) for i in range(5)
+        )
+        self.url = f"/api/tickets/{self.ticket.id}/messages/"
+        self.client.force_authenticate(self.youth)
+
+    def test_impossible_since_is_rejected(self):
+        for since in ("2024-02-30T00:00:00", "yesterday"):
+            response = self.client.get(self.url, {"since": since})
+            self.assertEqual(response.status_code, 400, since)
+
+    def test_plain_get_is_bounded(self):
+        with mock.patch("backend.core.api.ticket_views.MESSAGE_SYNC_LIMIT", 3):
+            response = self.client.get(self.url)
+
+        self.assertEqual([m["message"] for m in response.data], ["0", "1", "2"])
+        self.assertEqual(response["X-Has-More"], "true")
+
+    def test_after_id_continues_from_last_seen(self):
+        third = TicketMessage.objects.get(message="2")
+
+        response = self.client.get(self.url, {"after_id": third.id})
+
+        self.assertEqual([m["message"] for m in response.data], ["3", "4"])
+        self.assertEqual(response["X-Has-More"], "false")
@@ -0,0 +1,69 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.core import token_denylist
+from backend.core.models import DeniedToken, User
+
+
+class TokenDenylistTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("youth", password="x", role="youth")
+        self.refresh = RefreshToken.for_user(self.user)
+
+    def refresh_with(self, token):
+        return self.client.post("/api/token/refresh/", {"refresh": str(token)}, format="json")
+
+    def test_rotation_spends_the_old_refresh_token(self):
+        response = self.refresh_with(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data["refresh"], str(self.refresh))
+
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+        self.assertEqual(self.refresh_with(response.data["refresh"]).status_code, 200)
+
+    def test_logged_out_token_cannot_refresh(self):
+        self.client.post("/api/logout/", {"refresh": str(self.refresh)}, format="json")
+
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+
+    def test_token_is_spent_once(self):
+        exp = int(time.time()) + 60
+
+        self.assertTrue(token_denylist.deny("jti-1", exp))
+        self.assertFalse(token_denylist.deny("jti-1", exp))
+
+    def test_denial_outlives_the_cache(self):
+        token_denylist.deny("jti-1", int(time.time()) + 60)
+
+        # A per-process cache is not trusted: misses go to the database
+        cache.clear()
+        self.assertTrue(token_denylist.is_denied("jti-1"))
+        self.assertFalse(token_denylist.is_denied("jti-2"))
+
+    @mock.patch.object(token_denylist, "TRUST_CACHE_MISSES", True)
+    def test_shared_cache_warms_from_buffered_rows(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            token_denylist.deny("jti-1", int(time.time()) + 60)
+        token_denylist.denied_tokens.flush()
+        self.assertTrue(DeniedToken.objects.filter(jti="jti-1").exists())
+
+        # Cold cache (e.g. after a restart): warmed from the rows once
+        cache.clear()
+        self.assertTrue(token_denylist.is_denied("jti-1"))
+        self.assertFalse(token_denylist.is_denied("jti-2"))
+        self.assertTrue(cache.get(token_denylist.WARM_KEY))
+
+    def test_purge_keeps_live_entries(self):
+        now = timezone.now()
+        DeniedToken.objects.create(jti="expired", expires_at=now - timedelta(minutes=1))
+        DeniedToken.objects.create(jti="live", expires_at=now + timedelta(minutes=1))
+
+        self.assertEqual(token_denylist.purge_expired_tokens(), 1)
+        self.assertEqual(list(DeniedToken.objects.values_list("jti", flat=True)), ["live"])
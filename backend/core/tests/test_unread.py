@@ -0,0 +1,81 @@
+from django.test import TestCase
+
+from backend.core import unread
+from backend.core.models import Notification, Ticket, TicketMessage, UnreadCounter, User
+
+
+def counters():
+    return sorted(
+        UnreadCounter.objects.exclude(ticket_messages=0, notifications=0)
+        .values_list("user_id", "ticket_messages", "notifications")
+    )
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.youth = User.objects.create_user("youth", password="x", role="youth")
+        self.officer = User.objects.create_user("officer", password="x", role="officer")
+        self.other = User.objects.create_user("other", password="x", role="officer")
+        self.ticket = Ticket.objects.create(
+            youth=self.youth, officer=self.officer, title="t", description="d", category="grants"
+        )
+
+    def message(self, sender, text="hi"):
+        return TicketMessage.objects.create(ticket=self.ticket, sender=sender, message=text)
+
+    def messages(self, user):
+        return unread.unread_counts(user)["ticket_messages"]
+
+    def assert_matches_rebuild(self):
+        incremental = counters()
+        unread.rebuild_counters()
+        self.assertEqual(counters(), incremental)
+
+    def test_messages_count_for_the_other_party(self):
+        self.message(self.youth)
+        self.message(self.youth)
+        self.message(self.officer)
+
+        self.assertEqual((self.messages(self.officer), self.messages(self.youth)), (2, 1))
+        self.assert_matches_rebuild()
+
+    def test_mark_read_clears_only_the_readers_messages(self):
+        self.message(self.youth)
+        self.message(self.officer)
+
+        self.assertEqual(unread.mark_ticket_read(self.ticket, self.officer), 1)
+        self.assertEqual((self.messages(self.officer), self.messages(self.youth)), (0, 1))
+        self.assert_matches_rebuild()
+
+    def test_reassign_moves_unread_messages(self):
+        self.message(self.youth)
+        self.message(self.youth)
+
+        self.ticket.officer = self.other
+        self.ticket.save()
+
+        self.assertEqual((self.messages(self.officer), self.messages(self.other)), (0, 2))
+        self.assert_matches_rebuild()
+
+    def test_deleting_messages_and_tickets_takes_them_off(self):
+        first = self.message(self.youth)
+        self.message(self.youth)
+        self.message(self.officer)
+
+        first.delete()
+        self.assertEqual(self.messages(self.officer), 1)
+
+        self.ticket.delete()
+        self.assertEqual(counters(), [])
+
+    def test_notifications(self):
+        Notification.objects.create(user=self.youth, message="a")
+        read_later = Notification.objects.create(user=self.youth, message="b")
+
+        read_later.is_read = True
+        read_later.save()
+        self.assertEqual(unread.unread_counts(self.youth)["notifications"], 1)
+        self.assert_matches_rebuild()
+
+        unread.mark_notifications_read(self.youth)
+        self.assertEqual(unread.unread_counts(self.youth)["notifications"], 0)
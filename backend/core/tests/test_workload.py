@@ -0,0 +1,57 @@
+from django.test import TestCase
+
+from backend.core import workload
+from backend.core.models import OfficerWorkload, Ticket, User
+
+
+def loads():
+    return dict(OfficerWorkload.objects.values_list("officer__username", "active_tickets"))
+
+
+class OfficerWorkloadTests(TestCase):
+    def setUp(self):
+        self.youth = User.objects.create_user("youth", password="x", role="youth")
+        self.first = User.objects.create_user("first", password="x", role="officer")
+        self.second = User.objects.create_user("second", password="x", role="officer")
+        workload.rebuild_workloads()
+
+    def create_ticket(self, **fields):
+        return Ticket.objects.create(
+            youth=self.youth, title="t", description="d", category="grants", **fields
+        )
+
+    def test_only_active_tickets_count(self):
+        ticket = self.create_ticket(officer=self.first)
+        self.create_ticket(officer=self.first, status="resolved")
+        self.assertEqual(loads(), {"first": 1, "second": 0})
+
+        ticket.status = "resolved"
+        ticket.save()
+        self.assertEqual(loads(), {"first": 0, "second": 0})
+
+        ticket.status = "in_progress"
+        ticket.officer = self.second
+        ticket.save()
+        self.assertEqual(loads(), {"first": 0, "second": 1})
+
+        ticket.delete()
+        self.assertEqual(loads(), {"first": 0, "second": 0})
+
+    def test_least_loaded_officer_is_claimed(self):
+        self.create_ticket(officer=self.first)
+
+        self.assertEqual(workload.claim_least_loaded_officer(), self.second)
+
+        self.second.is_active = False
+        self.second.save()
+        self.assertEqual(workload.claim_least_loaded_officer(), self.first)
+
+    def test_incremental_counts_match_rebuild(self):
+        ticket = self.create_ticket(officer=self.first)
+        self.create_ticket(officer=self.second)
+        ticket.officer = self.second
+        ticket.save()
+
+        incremental = loads()
+        workload.rebuild_workloads()
+        self.assertEqual(loads(), incremental)
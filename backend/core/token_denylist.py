@@ -0,0 +1,121 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from backend.core.models import DeniedToken
+from backend.core.utils import BufferedWriter
+
+# A per-process cache can't see denials made by other workers, so only a
+# shared cache (Redis, Memcached, database) may answer "not denied" alone.
+TRUST_CACHE_MISSES = getattr(
+    settings,
+    "JWT_DENYLIST_TRUST_CACHE",
+    "LocMemCache" not in settings.CACHES["default"]["BACKEND"],
+)
+WARM_SECONDS = getattr(settings, "JWT_DENYLIST_WARM_SECONDS", 24 * 3600)
+WARM_CHUNK_SIZE = 5000
+
+WARM_KEY = "jwt-deny:warm"
+WARMING_KEY = "jwt-deny:warming"
+
+# The cache answers lookups; rows only back it up, so they are written
+# in batches rather than after every refresh.
+denied_tokens = BufferedWriter(
+    DeniedToken, max_size=500, max_age=30.0,
+    ignore_conflicts=True, flush_on_request=False,
+)
+
+
+def _key(jti):
+    return f"jwt-deny:{jti}"
+
+
+def warm_cache():
+    """
+    Copy every live denylist row into the cache, then set the marker
+    that lets cache misses be trusted. One worker warms at a time;
+    returns True once the cache is warm.
+    """
+    if not cache.add(WARMING_KEY, True, 300):
+        return False
+
+    try:
+        rows = (
+            DeniedToken.objects
+            .filter(expires_at__gt=timezone.now())
+            .order_by("expires_at")
+            .values_list("jti", "expires_at")
+        )
+        chunk = []
+        for row in rows.iterator(chunk_size=WARM_CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) == WARM_CHUNK_SIZE:
+                _cache_chunk(chunk)
+                chunk = []
+        _cache_chunk(chunk)
+
+        cache.set(WARM_KEY, True, WARM_SECONDS)
+        return True
+    finally:
+        cache.delete(WARMING_KEY)
+
+
+def _cache_chunk(chunk):
+    if not chunk:
+        return
+    # Rows are ordered by expiry: the last one's TTL covers the chunk
+    ttl = (chunk[-1][1] - timezone.now()).total_seconds()
+    if ttl > 0:
+        cache.set_many({_key(jti): True for jti, _ in chunk}, ttl)
+
+
+def is_denied(jti):
+    found = cache.get_many([_key(jti), WARM_KEY])
+    if found.get(_key(jti)):
+        return True
+    if TRUST_CACHE_MISSES:
+        if found.get(WARM_KEY):
+            return False
+        if warm_cache():
+            # The row may only have been in the database until now
+            return bool(cache.get(_key(jti)))
+
+    return DeniedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+
+
+def deny(jti, exp):
+    """
+    Deny `jti` until `exp` (a unix timestamp). Returns False when it was
+    already denied, so a token can be spent exactly once.
+    """
+    ttl = exp - time.time()
+    if ttl <= 0:
+        return True
+    if is_denied(jti) or not cache.add(_key(jti), True, ttl):
+        return False
+
+    expires_at = datetime.fromtimestamp(exp, tz=dt_timezone.utc)
+    if TRUST_CACHE_MISSES:
+        denied_tokens.add(jti=jti, expires_at=expires_at)
+        return True
+
+    # Other workers only see denials in the database
+    _, created = DeniedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    return created
+
+
+def purge_expired_tokens(chunk_size=5000):
+    """Delete denylist rows whose tokens have expired; returns the number removed."""
+    removed = 0
+    while True:
+        jtis = list(
+            DeniedToken.objects
+            .filter(expires_at__lte=timezone.now())
+            .values_list("jti", flat=True)[:chunk_size]
+        )
+        if not jtis:
+            return removed
+        removed += DeniedToken.objects.filter(jti__in=jtis).delete()[0]
@@ -0,0 +1,116 @@
+from collections import Counter
+
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from backend.core.models import Notification, Ticket, TicketMessage, UnreadCounter
+
+
+def bump(user_id, **deltas):
+    """Add `deltas` (ticket_messages / notifications) to a user's counters."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if user_id is None or not deltas:
+        return
+
+    updated = UnreadCounter.objects.filter(user_id=user_id).update(
+        **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+    )
+    if not updated:
+        counter, created = UnreadCounter.objects.get_or_create(
+            user_id=user_id,
+            defaults={field: max(delta, 0) for field, delta in deltas.items()},
+        )
+        if not created:
+            bump(user_id, **deltas)
+
+
+def messages_created(messages):
+    """Count new unread messages for their recipients (for bulk inserts)."""
+    messages = [message for message in messages if not message.is_read]
+    if not messages:
+        return
+
+    tickets = Ticket.objects.in_bulk({message.ticket_id for message in messages})
+    recipients = Counter(
+        message.recipient_id(tickets[message.ticket_id]) for message in messages
+    )
+    for user_id, count in recipients.items():
+        bump(user_id, ticket_messages=count)
+
+
+def ticket_reassigned(ticket, old_officer_id, new_officer_id):
+    """
+    Move the youth's unread messages on `ticket` from the old officer's
+    counter to the new one's. Messages on an unassigned ticket count for
+    nobody until an officer is assigned.
+    """
+    if old_officer_id == new_officer_id:
+        return
+
+    count = ticket.messages.filter(is_read=False, sender_id=ticket.youth_id).count()
+    if count:
+        bump(old_officer_id, ticket_messages=-count)
+        bump(new_officer_id, ticket_messages=count)
+
+
+def mark_ticket_read(ticket, user):
+    """
+    Mark every message addressed to `user` in `ticket` as read with one
+    UPDATE, and take them off the user's counter.
+    """
+    messages = ticket.messages.filter(is_read=False)
+    if user.id == ticket.youth_id:
+        messages = messages.exclude(sender_id=ticket.youth_id)
+    elif user.id == ticket.officer_id:
+        messages = messages.filter(sender_id=ticket.youth_id)
+    else:
+        return 0
+
+    marked = messages.update(is_read=True)
+    bump(user.id, ticket_messages=-marked)
+    return marked
+
+
+def mark_notifications_read(user):
+    marked = Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+    UnreadCounter.objects.filter(user=user).update(notifications=0)
+    return marked
+
+
+def unread_counts(user):
+    counts = UnreadCounter.objects.filter(user=user).values(
+        "ticket_messages", "notifications"
+    ).first()
+    return counts or {"ticket_messages": 0, "notifications": 0}
+
+
+def rebuild_counters():
+    """Recount every user's unread messages and notifications."""
+    totals = {}
+
+    def add(rows, key, field):
+        for row in rows:
+            if row[key] is not None:
+                totals.setdefault(row[key], Counter())[field] += row["count"]
+
+    unread = TicketMessage.objects.filter(is_read=False)
+    add(
+        unread.exclude(sender=F("ticket__youth"))
+        .values("ticket__youth").annotate(count=Count("id")).order_by(),
+        "ticket__youth", "ticket_messages",
+    )
+    add(
+        unread.filter(sender=F("ticket__youth"))
+        .values("ticket__officer").annotate(count=Count("id")).order_by(),
+        "ticket__officer", "ticket_messages",
+    )
+    add(
+        Notification.objects.filter(is_read=False)
+        .values("user").annotate(count=Count("id")).order_by(),
+        "user", "notifications",
+    )
+
+    UnreadCounter.objects.all().delete()
+    UnreadCounter.objects.bulk_create(
+        UnreadCounter(user_id=user_id, **counts) for user_id, counts in totals.items()
+    )
@@ -1,8 +1,120 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.db import transaction
+
 from .models import AuditLog
 
-def log_action(user, action, ticket=None):
-    AuditLog.objects.create(
-        user=user,
-        action=action,
-        ticket=ticket
-    )
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """
+    Per-process write buffer for append-only rows.
+
+    `add()` only appends to a list; rows are written with one
+    bulk_create once `max_size` rows are queued, once the oldest row is
+    `max_age` seconds old, at the end of every request (unless
+    `flush_on_request` is off) and at exit. A row added inside a
+    transaction is queued when it commits and dropped if it rolls back.
+    Rows still buffered when the process dies are lost, so anything
+    that must be durable should be saved directly instead.
+    """
+
+    instances = []
+
+    def __init__(self, model, max_size=200, max_age=2.0, ignore_conflicts=False,
+                 flush_on_request=True):
+        self.model = model
+        self.ignore_conflicts = ignore_conflicts
+        self.flush_on_request = flush_on_request
+        self.max_size = max_size
+        self.max_age = max_age
+        self._rows = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        BufferedWriter.instances.append(self)
+
+    def add(self, **fields):
+        row = self.model(**fields)
+        if transaction.get_connection().in_atomic_block:
+            # on_commit callbacks run after the outermost commit, so a due
+            # flush never joins (or rolls back with) the caller's transaction
+            transaction.on_commit(lambda: self._append(row))
+        else:
+            self._append(row)
+
+    def _append(self, row):
+        with self._lock:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.append(row)
+            due = self._due()
+        if due:
+            self.flush()
+
+    def due(self):
+        with self._lock:
+            return self._due()
+
+    def _due(self):
+        return bool(self._rows) and (
+            len(self._rows) >= self.max_size
+            or time.monotonic() - self._oldest >= self.max_age
+        )
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(
+                    rows,
+                    batch_size=self.max_size,
+                    ignore_conflicts=self.ignore_conflicts,
+                )
+        except Exception:
+            # One bad row (e.g. for a ticket deleted since it was added)
+            # should not cost the rest of the batch.
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        row.save(force_insert=True)
+                except Exception:
+                    logger.exception("Dropping buffered %s row", self.model.__name__)
+
+
+def flush_buffers():
+    for writer in BufferedWriter.instances:
+        writer.flush()
+
+
+def flush_request_buffers(**kwargs):
+    """request_finished receiver."""
+    for writer in BufferedWriter.instances:
+        if writer.flush_on_request or writer.due():
+            writer.flush()
+
+
+atexit.register(flush_buffers)
+
+audit_log = BufferedWriter(AuditLog)
+
+
+def log_action(user, action, ticket=None, durable=False):
+    """
+    Record an audit entry. Buffered by default; `durable=True` writes it
+    now, inside the caller's transaction.
+    """
+    user_id = getattr(user, "pk", user)
+    ticket_id = getattr(ticket, "pk", ticket)
+
+    if durable:
+        AuditLog.objects.create(user_id=user_id, action=action, ticket_id=ticket_id)
+    else:
+        audit_log.add(user_id=user_id, action=action, ticket_id=ticket_id)
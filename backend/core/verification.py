@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from backend.core.models import VerificationCode
+
+CODE_TTL = timedelta(minutes=getattr(settings, "VERIFICATION_CODE_MINUTES", 30))
+
+
+def issue_code(user):
+    """Replace the user's pending codes with a fresh one and return it."""
+    code = get_random_string(6, allowed_chars="0123456789")
+
+    with transaction.atomic():
+        VerificationCode.objects.filter(user=user).delete()
+        VerificationCode.objects.create(
+            user=user,
+            code=code,
+            expires_at=timezone.now() + CODE_TTL,
+        )
+    return code
+
+
+def redeem_code(code, email=None, phone=None):
+    """
+    Verify the account that `code` was issued to, found by `email` or,
+    for accounts without one, `phone`.
+    Returns the user, or None for an unknown, mismatched or expired code.
+    """
+    account = {"user__email": email} if email else {"user__phone": phone}
+    with transaction.atomic():
+        match = (
+            VerificationCode.objects
+            .select_related("user")
+            .filter(
+                **account,
+                code=code,
+                expires_at__gt=timezone.now(),
+            )
+            .first()
+        )
+        if match is None:
+            return None
+
+        user = match.user
+        user.is_verified = True
+        user.save(update_fields=["is_verified"])
+        VerificationCode.objects.filter(user=user).delete()
+
+    return user
+
+
+def purge_expired_codes(chunk_size=5000):
+    """Delete expired codes in chunks; returns the number removed."""
+    removed = 0
+    while True:
+        ids = list(
+            VerificationCode.objects
+            .filter(expires_at__lte=timezone.now())
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return removed
+        removed += VerificationCode.objects.filter(id__in=ids).delete()[0]
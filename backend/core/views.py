@@ -4,8 +4,6 @@
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.db.models import Avg
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
 from rest_framework import viewsets, permissions, generics
 from rest_framework.decorators import action, api_view
@@ -34,6 +32,10 @@ from .models import (
     YouthHubCategory,
 )
 
+from .pagination import FeedPagination
+from .reference_cache import CachedReadMixin
+from .search import kb_index, search_knowledge_base
+from .unread import mark_notifications_read
 from .serializers import (
     UserSerializer,
     KnowledgeBaseSerializer,
@@ -63,18 +65,50 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return User.objects.all() if self.request.user.role == "admin" else User.objects.filter(id=self.request.user.id)
 
-class KnowledgeBaseViewSet(viewsets.ModelViewSet):
-    queryset = KnowledgeBase.objects.all()
+class KnowledgeBaseViewSet(CachedReadMixin, viewsets.ModelViewSet):
+    queryset = KnowledgeBase.objects.order_by("-created_at", "-id")
     serializer_class = KnowledgeBaseSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    cache_namespace = "knowledge_base"
 
-    @method_decorator(cache_page(60 * 5))
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
-
-class YouthHubListView(generics.ListAPIView):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+
+        # ?category=faq&q=grant application -> ranked full-text search
+        category = self.request.query_params.get("category")
+        if category:
+            queryset = queryset.filter(category=category)
+
+        query = self.request.query_params.get("q", "").strip()
+        if query:
+            queryset = search_knowledge_base(queryset, query)
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def suggest(self, request):
+        """
+        Articles matching a ticket draft, served from the in-memory index
+        so clients can call it while the youth types.
+        ?title=...&description=...&category=faq&k=5
+        """
+        draft = f"{request.query_params.get('title', '')} {request.query_params.get('description', '')}"
+        try:
+            k = min(max(int(request.query_params.get("k", 5)), 1), 20)
+        except ValueError:
+            k = 5
+
+        matches = kb_index.search(draft, k=k, category=request.query_params.get("category"))
+        return Response([
+            {"id": article_id, "title": title, "category": category, "score": round(score, 3)}
+            for article_id, title, category, score in matches
+        ])
+
+class YouthHubListView(CachedReadMixin, generics.ListAPIView):
     queryset = YouthHubCategory.objects.filter(is_active=True)
     serializer_class = YouthHubCategorySerializer
+    cache_namespace = "youth_hub"
     
 
 class ApplicationViewSet(viewsets.ModelViewSet):
@@ -103,29 +137,40 @@ class FeedbackViewSet(viewsets.ModelViewSet):
 class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FeedPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.filter(user=self.request.user).order_by(
+            "-created_at", "-id"
+        )
+
+    @action(detail=False, methods=["post"], url_path="mark-all-read")
+    def mark_all_read(self, request):
+        marked = mark_notifications_read(request.user)
+        return Response({"marked_read": marked})
 
 class TicketNoteViewSet(viewsets.ModelViewSet):
     queryset = TicketNote.objects.all()
     serializer_class = TicketNoteSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class MinistryInfoViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = MinistryInfo.objects.all()
+class MinistryInfoViewSet(CachedReadMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = MinistryInfo.objects.prefetch_related("officers")
     serializer_class = MinistryInfoSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "ministry"
 
-class ProgramViewSet(viewsets.ReadOnlyModelViewSet):
+class ProgramViewSet(CachedReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Program.objects.all()
     serializer_class = ProgramSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "programs"
 
-class WorkflowViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Workflow.objects.all()
+class WorkflowViewSet(CachedReadMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Workflow.objects.prefetch_related("escalations")
     serializer_class = WorkflowSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespace = "workflows"
 
 class YouthProfileViewSet(viewsets.ModelViewSet):
     serializer_class = YouthProfileSerializer
@@ -0,0 +1,82 @@
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from backend.core.models import OfficerWorkload, Ticket, User
+
+
+def active_officer_id(status, officer_id):
+    """Officer whose workload a ticket in this state counts towards."""
+    if status in Ticket.ACTIVE_STATUSES:
+        return officer_id
+    return None
+
+
+def adjust_workload(officer_id, delta):
+    if officer_id is None or delta == 0:
+        return
+
+    updated = OfficerWorkload.objects.filter(officer_id=officer_id).update(
+        active_tickets=Greatest(F("active_tickets") + delta, 0)
+    )
+    if not updated and delta > 0:
+        workload, created = OfficerWorkload.objects.get_or_create(
+            officer_id=officer_id,
+            defaults={"active_tickets": delta},
+        )
+        if not created:
+            adjust_workload(officer_id, delta)
+
+
+def ticket_changed(before, after):
+    """
+    Move a ticket's weight between officers.
+    `before` / `after` are the ticket's tracked values, None for a ticket
+    that was just created / deleted.
+    """
+    old = active_officer_id(before["status"], before["officer_id"]) if before else None
+    new = active_officer_id(after["status"], after["officer_id"]) if after else None
+
+    if old != new:
+        adjust_workload(old, -1)
+        adjust_workload(new, +1)
+
+
+def claim_least_loaded_officer():
+    """
+    Lock and return the least loaded active officer, or None.
+
+    Must run inside the transaction that saves the ticket: the row lock
+    is held until commit, so concurrent creates skip to the next officer
+    instead of piling onto the same one.
+    """
+    candidates = (
+        OfficerWorkload.objects
+        .select_related("officer")
+        .filter(officer__role="officer", officer__is_active=True)
+        .order_by("active_tickets", "officer_id")
+    )
+
+    workload = candidates.select_for_update(skip_locked=True, of=("self",)).first()
+    if workload is None:
+        # Every officer is mid-assignment: wait for a lock rather than leave
+        # the ticket unassigned.
+        workload = candidates.select_for_update(of=("self",)).first()
+
+    return workload.officer if workload else None
+
+
+def rebuild_workloads():
+    """Recount every officer's workload from the ticket table."""
+    officers = User.objects.filter(role="officer").annotate(
+        active=Count(
+            "assigned_tickets",
+            filter=Q(assigned_tickets__status__in=Ticket.ACTIVE_STATUSES),
+        )
+    )
+
+    OfficerWorkload.objects.exclude(officer__role="officer").delete()
+    for officer in officers:
+        OfficerWorkload.objects.update_or_create(
+            officer=officer,
+            defaults={"active_tickets": officer.active},
+        )
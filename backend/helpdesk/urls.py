@@ -66,6 +66,7 @@ urlpatterns = [
 
     # ---------- AUTH ----------
     path("api/login/", auth_views.login_view),
+    path("api/logout/", auth_views.logout_view),
     path("api/register/", auth_views.register_user),
     path("api/onboard/", auth_views.onboard_youth),
     path("api/verify-account/", auth_views.verify_account),
@@ -87,6 +88,9 @@ urlpatterns = [
     # ---------- EXPORTS ----------
     path("api/tickets/export/csv/", export_views.export_tickets_csv),
     path("api/tickets/export/pdf/", export_views.export_tickets_pdf),
+    path("api/tickets/export/pdf/jobs/", export_views.submit_pdf_report),
+    path("api/tickets/export/pdf/jobs/<int:job_id>/", export_views.pdf_report_status),
+    path("api/tickets/export/pdf/jobs/<int:job_id>/download/", export_views.download_pdf_report),
     path("profile/update/", update_profile),
     # ---------- ROUTER ----------
     path("api/", include(router.urls)),
@@ -81,16 +81,16 @@ sentry_sdk.init(
     send_default_pii=True
 )
 
+# Per-process by default; set CACHE_URL (e.g. redis://localhost:6379/1) so
+# every worker shares cached reference data, JWT users and the denylist.
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
 }
 
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'backend.core.authentication.CachedJWTAuthentication',
     ),
      "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -154,6 +154,8 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),      # default is 1 day
     "ROTATE_REFRESH_TOKENS": True,                    # optional: issue new refresh token on use
     "BLACKLIST_AFTER_ROTATION": True,                 # optional: prevent reuse of old refresh tokens
+    # Rotated / logged-out tokens go to core's jti denylist (no token_blacklist app)
+    "TOKEN_REFRESH_SERIALIZER": "backend.core.serializers.DenylistTokenRefreshSerializer",
 }
 
 
@@ -207,6 +209,17 @@ CHANNEL_LAYERS = {
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'core.User'
+# Username or email in one query, with a cache-backed failed-login throttle
+AUTHENTICATION_BACKENDS = ["backend.core.auth_backends.EmailOrUsernameBackend"]
+# Workflow (by name) whose SLA hours and escalation matrix drive the SLA
+# sweep for each ticket category; other categories use the inquiry workflow
+TICKET_CATEGORY_WORKFLOWS = {
+    "grants": "application",
+    "training": "application",
+    "startup": "application",
+    "incident": "complaint",
+}
+TICKET_DEFAULT_WORKFLOW = "inquiry"
 # Celery settings
 # CELERY_BROKER_URL = 'redis://localhost:6379/0'   # 👈 Redis as broker
 # CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
@@ -215,4 +228,29 @@ AUTH_USER_MODEL = 'core.User'
 #        "task": "backend.core.task.send_deadline_reminders",
 #        "schedule": crontab(minute=0, hour="*"),  # every hour
 #    },
-# }
\ No newline at end of file
+#    "escalate-sla-breaches-every-5-minutes": {
+#        "task": "backend.core.task.escalate_sla_breaches",
+#        "schedule": crontab(minute="*/5"),
+#    },
+#    "drain-notification-outbox-every-minute": {
+#        "task": "backend.core.task.process_notification_outbox",
+#        "schedule": crontab(minute="*"),
+#    },
+#    "purge-verification-codes-hourly": {
+#        "task": "backend.core.task.purge_verification_codes",
+#        "schedule": crontab(minute=30, hour="*"),
+#    },
+#    "purge-denied-tokens-daily": {
+#        "task": "backend.core.task.purge_denied_tokens",
+#        "schedule": crontab(minute=15, hour=3),
+#    },
+#    "purge-ticket-signatures-daily": {
+#        "task": "backend.core.task.purge_ticket_signatures",
+#        "schedule": crontab(minute=45, hour=3),
+#    },
+# }
+# Without Celery, run `python manage.py escalate_sla_breaches`,
+# `python manage.py purge_verification_codes`,
+# `python manage.py purge_denied_tokens` and
+# `python manage.py purge_ticket_signatures` from cron
+# and keep `python manage.py drain_outbox --loop` running.
\ No newline at end of file